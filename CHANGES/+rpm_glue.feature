@@ -0,0 +1,3 @@
+The rpm modules now use pulp-glue.
+`rpm_repository` now also sets a `repo_config` given as a JSON encoded string. It fails on servers with pulp_rpm<3.24, which do not offer `repo_config`.
+`rpm_distribution` fails when asked to disable `generate_repo_config` on servers with pulp_rpm<3.23, which always generate the config.repo file.
@@ -42,6 +42,50 @@ options:
       - It is recommended to use this once with the M(pulp.squeezer.status) module at the beginning of the playbook.
     type: bool
     default: false
+  retries:
+    description:
+      - Number of times a request is retried after a transient error.
+      - Failed connections are retried for all requests. Responses with status 429, 502, 503 or 504 and dropped connections are only retried for GET and HEAD requests, which includes waiting for tasks.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_RETRIES) will be used as a fallback.
+      - Use C(0) to disable retries.
+    type: int
+    default: 3
+    version_added: "0.0.16"
+  retry_backoff:
+    description:
+      - Base of the exponential backoff between retries in seconds.
+      - The pause before a retry is a random value between half and all of the backoff, doubling with each retry. A C(Retry-After) header of the server takes precedence.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_RETRY_BACKOFF) will be used as a fallback.
+    type: float
+    default: 1.0
+    version_added: "0.0.16"
+  api_rate_limit:
+    description:
+      - Maximum number of requests per second to send to this C(pulp_url), shared by all modules running on the same host at the same time, e.g. in different forks.
+      - The limit is coordinated through lock files in the squeezer cache directory. Short bursts of up to one second worth of requests are allowed.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_API_RATE_LIMIT) will be used as a fallback.
+      - If neither is set, the request rate is not limited.
+    type: float
+    required: false
+    version_added: "0.0.16"
+  api_concurrency:
+    description:
+      - Maximum number of concurrent requests to this C(pulp_url), shared by all modules running on the same host at the same time.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_API_CONCURRENCY) will be used as a fallback.
+      - If neither is set, the number of concurrent requests is not limited.
+    type: int
+    required: false
+    version_added: "0.0.16"
+  session_auth:
+    description:
+      - Whether to log in once and authenticate with a session cookie instead of sending the password with every request, which the server has to verify each time.
+      - The session is cached in the squeezer cache directory per server and user until it expires, and is reused by later module runs.
+      - If the server rejects the session, the request is sent again with the password. Servers without a login endpoint are always sent the password.
+      - With the glue client, this needs pulp-glue 0.24 or later. Older versions send the password with every request and warn about it.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_SESSION_AUTH) will be used as a fallback.
+    type: bool
+    default: false
+    version_added: "0.0.16"
 """
 
     GLUE = r"""
@@ -65,6 +109,23 @@ options:
       - Time in seconds to wait for tasks.
     type: int
     default: 10
+  task_queue_ratio:
+    description:
+      - Hold back calls that dispatch tasks while the server has this many or more waiting tasks per online worker.
+      - The module then checks the queue again with a growing pause of up to 30 seconds, for at most I(task_queue_timeout) seconds.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_TASK_QUEUE_RATIO) will be used as a fallback.
+      - If neither is set, tasks are dispatched right away.
+    type: float
+    required: false
+    version_added: "0.0.16"
+  task_queue_timeout:
+    description:
+      - Time in seconds to wait for the task queue to drain below I(task_queue_ratio) before failing.
+      - If no value is specified, the value of the environment variable C(SQUEEZER_TASK_QUEUE_TIMEOUT) will be used as a fallback.
+      - If neither is set, I(timeout) is used.
+    type: int
+    required: false
+    version_added: "0.0.16"
 """
 
     ENTITY_STATE = r"""
@@ -88,6 +149,35 @@ options:
       - present
 """
 
+    LABEL_SELECT = r"""
+options:
+  pulp_label_select:
+    description:
+      - Label selector to address all matching entities at once instead of a single one by name, e.g. C(tier=edge) or C(tier=edge,!deprecated).
+      - The entities are found by listing them filtered by the selector, in pages of 100.
+    type: str
+    required: false
+    version_added: "0.0.16"
+  concurrency:
+    description:
+      - Number of tasks to have in flight at once for the entities selected by I(pulp_label_select).
+    type: int
+    default: 4
+    version_added: "0.0.16"
+"""
+
+    SNAPSHOT = r"""
+options:
+  snapshot:
+    description:
+      - Snapshot of the server state as gathered by M(pulp.squeezer.snapshot_facts), usually C(pulp_snapshot).
+      - If it covers the type of this entity and this C(pulp_url), the entity is taken from the snapshot instead of being looked up on the server. Entities missing in the snapshot are looked up on the server, in case they were created after the snapshot was taken. With C(state=absent), the entity is always looked up on the server, in case it was deleted since.
+      - Other changes made since the snapshot was taken are not seen, so take the snapshot in the same play before making changes.
+    type: dict
+    required: false
+    version_added: "0.0.16"
+"""
+
     REMOTE = r"""
 options:
   name:
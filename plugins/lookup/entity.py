@@ -0,0 +1,287 @@
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+name: entity
+short_description: Look up Pulp entities by name or filter
+description:
+  - "Find repositories, remotes, distributions or publications on a Pulp server without running a module, e.g. to template their hrefs into the arguments of later tasks."
+  - "All names given to one lookup are resolved with a single list request per 50 names."
+  - "Found entities are remembered for the rest of the playbook run. Later lookups of the same entities, in any task, are answered without asking the server again."
+version_added: "0.0.16"
+options:
+  _terms:
+    description:
+      - Names of the entities to look up.
+      - Leave empty when using O(filter).
+      - Publications have no names, so they can only be looked up with O(filter).
+    type: list
+    elements: str
+  type:
+    description:
+      - Type of the entities, made of the plugin, optionally the resource type, and one of C(repository), C(remote), C(distribution) or C(publication).
+      - For example C(file_repository), C(rpm_distribution) or C(ansible_collection_remote).
+    type: str
+    required: true
+  filter:
+    description:
+      - Filters to list entities with instead of looking them up by name, e.g. C(pulp_label_select).
+      - The lookup returns all entities matching the filters.
+    type: dict
+  field:
+    description:
+      - Return only this attribute of each entity instead of the whole entity, e.g. C(pulp_href) or C(latest_version_href).
+    type: str
+  allow_missing:
+    description:
+      - Return C(None) for names not found instead of failing.
+    type: bool
+    default: false
+  cache:
+    description:
+      - Whether to reuse entities looked up earlier in this playbook run.
+      - Disable this to see changes made by earlier tasks, like a new C(latest_version_href) after a sync.
+      - Entities that were not found are never remembered, while an empty result of a O(filter) is.
+    type: bool
+    default: true
+  pulp_url:
+    description:
+      - URL of the server to connect to (without 'pulp/api/v3').
+    type: str
+    required: true
+    env:
+      - name: SQUEEZER_PULP_URL
+  username:
+    description:
+      - Username of api user.
+    type: str
+    env:
+      - name: SQUEEZER_USERNAME
+  password:
+    description:
+      - Password of api user.
+    type: str
+    env:
+      - name: SQUEEZER_PASSWORD
+  user_cert:
+    description:
+      - Client certificate of api user.
+    type: str
+  user_key:
+    description:
+      - Client certificate key of api user.
+    type: str
+  validate_certs:
+    description:
+      - Whether SSL certificates should be verified.
+    type: bool
+    default: true
+    env:
+      - name: SQUEEZER_VALIDATE_CERTS
+  timeout:
+    description:
+      - Time in seconds to wait for the server, e.g. to log in with O(session_auth).
+    type: int
+    default: 10
+  retries:
+    description:
+      - Number of times a request is retried after a transient error.
+      - Use C(0) to disable retries.
+    type: int
+    default: 3
+    env:
+      - name: SQUEEZER_RETRIES
+  retry_backoff:
+    description:
+      - Base of the exponential backoff between retries in seconds.
+    type: float
+    default: 1.0
+    env:
+      - name: SQUEEZER_RETRY_BACKOFF
+  session_auth:
+    description:
+      - Whether to log in once and authenticate with a session cookie instead of sending the password with every request.
+      - The session is shared with the modules connecting to the same server as the same user.
+    type: bool
+    default: false
+    env:
+      - name: SQUEEZER_SESSION_AUTH
+notes:
+  - Lookups run on the controller, so pulp-glue needs to be installed there.
+  - The entities are remembered in the local temporary directory of the playbook run, which is removed when the run ends.
+author:
+  - Pulp Squeezer contributors (@pulp)
+"""
+
+EXAMPLES = r"""
+- name: Distribute the latest version of a repository
+  pulp.squeezer.file_distribution:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    name: my_files
+    base_path: files/my
+    repository: my_file_repo
+  vars:
+    version: >-
+      {{ lookup('pulp.squeezer.entity', 'my_file_repo', type='file_repository', field='latest_version_href',
+                pulp_url='https://pulp.example.org', username='admin', password='password') }}
+
+- name: Resolve many repositories with one request
+  ansible.builtin.debug:
+    msg: "{{ item.name }}: {{ item.latest_version_href }}"
+  loop: "{{ query('pulp.squeezer.entity', 'repo_a', 'repo_b', 'repo_c', type='rpm_repository') }}"
+  environment:
+    SQUEEZER_PULP_URL: https://pulp.example.org
+    SQUEEZER_USERNAME: admin
+    SQUEEZER_PASSWORD: password
+
+- name: Find all production repositories by label
+  ansible.builtin.set_fact:
+    production_repositories: >-
+      {{ query('pulp.squeezer.entity', type='file_repository', filter={'pulp_label_select': 'env=production'},
+               field='pulp_href') }}
+"""
+
+RETURN = r"""
+  _raw:
+    description:
+      - The entities, or the requested O(field) of them, in the order of the names.
+    type: list
+    elements: raw
+"""
+
+
+import hashlib
+import json
+import os
+import tempfile
+
+from ansible import constants as C
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PULP_CLI_IMPORT_ERR,
+    SqueezerException,
+    entity_context_class,
+    list_entities,
+    lookup_by_name,
+    pulp_context,
+)
+
+try:
+    from pulp_glue.common.context import PulpException
+except ImportError:
+    PulpException = SqueezerException
+
+
+class LookupCache:
+    """
+    Entities remembered for the current playbook run.
+
+    Lookups run in a forked worker process per task. The local temporary directory of ansible is
+    created by the main process and removed when it exits, so it is shared by all tasks of the run.
+    """
+
+    def __init__(self, pulp_url, username, entity_type):
+        server = hashlib.sha256(f"{pulp_url}\n{username}".encode()).hexdigest()[:16]
+        self.path = os.path.join(C.DEFAULT_LOCAL_TMP, "squeezer_lookup", server, entity_type)
+
+    def _file(self, key):
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def __contains__(self, key):
+        return os.path.exists(self._file(key))
+
+    def get(self, key):
+        try:
+            with open(self._file(key)) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=self.path, delete=False) as cache_file:
+            json.dump(value, cache_file)
+        os.replace(cache_file.name, self._file(key))
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        if PULP_CLI_IMPORT_ERR is not None:
+            raise AnsibleLookupError(f"The pulp-glue library is required.\n{PULP_CLI_IMPORT_ERR}")
+        self.set_options(var_options=variables, direct=kwargs)
+        entity_filter = self.get_option("filter")
+        if bool(terms) == bool(entity_filter):
+            raise AnsibleLookupError("Specify either names or a 'filter'.")
+        if terms and self.get_option("type").endswith("_publication"):
+            raise AnsibleLookupError("Publications have no names, look them up with a 'filter'.")
+
+        try:
+            entities = self.lookup(terms, entity_filter)
+        except (PulpException, SqueezerException) as e:
+            raise AnsibleLookupError(str(e))
+
+        field = self.get_option("field")
+        if field is not None:
+            entities = [entity and entity.get(field) for entity in entities]
+        return entities
+
+    def lookup(self, names, entity_filter):
+        entity_type = self.get_option("type")
+        cache = LookupCache(self.get_option("pulp_url"), self.get_option("username"), entity_type)
+        use_cache = self.get_option("cache")
+
+        if entity_filter:
+            key = "filter:" + json.dumps(entity_filter, sort_keys=True)
+            if use_cache and key in cache:
+                return cache.get(key)
+            entities = list(list_entities(self.context(entity_type), entity_filter))
+            cache.set(key, entities)
+            return entities
+
+        found = {}
+        if use_cache:
+            for name in names:
+                if "name:" + name in cache:
+                    found[name] = cache.get("name:" + name)
+        missing = [name for name in names if name not in found]
+        if missing:
+            for name, entity in lookup_by_name(self.context(entity_type), missing).items():
+                found[name] = entity
+                cache.set("name:" + name, entity)
+        not_found = [name for name in names if name not in found]
+        if not_found and not self.get_option("allow_missing"):
+            raise AnsibleLookupError(
+                f"Could not find {entity_type} entities: {', '.join(sorted(set(not_found)))}."
+            )
+        return [found.get(name) for name in names]
+
+    def context(self, entity_type):
+        pulp_ctx = pulp_context(
+            {
+                "pulp_url": self.get_option("pulp_url"),
+                "username": self.get_option("username"),
+                "password": self.get_option("password"),
+                "user_cert": self.get_option("user_cert"),
+                "user_key": self.get_option("user_key"),
+                "validate_certs": self.get_option("validate_certs"),
+                "refresh_api_cache": False,
+                "timeout": self.get_option("timeout"),
+                "task_queue_ratio": None,
+                "retries": self.get_option("retries"),
+                "retry_backoff": self.get_option("retry_backoff"),
+                "api_rate_limit": None,
+                "api_concurrency": None,
+                "session_auth": self.get_option("session_auth"),
+            },
+            check_mode=True,
+        )
+        return entity_context_class(entity_type)(pulp_ctx)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from ansible.module_utils.six import string_types
+
+
+def unordered_list(value):
+    """
+    Canonical form of a list in which the order of the items does not matter.
+    """
+    return sorted(value, key=lambda item: json.dumps(item, sort_keys=True))
+
+
+def json_document(value):
+    """
+    Canonical form of a value that may be given as a JSON encoded string.
+    """
+    if isinstance(value, string_types):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+# Canonical forms of the attributes of entities by entity type, shared by all modules managing them.
+ENTITY_CANONICALIZERS = {
+    "python_remote": {"includes": unordered_list, "excludes": unordered_list},
+    "rpm_repository": {"repo_config": json_document},
+}
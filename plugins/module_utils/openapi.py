@@ -8,14 +8,26 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import errno
+import io
 import json
 import os
+import time
 import uuid
 
 from ansible.module_utils import six
 from ansible.module_utils._text import to_bytes
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.http_cookiejar import CookieJar
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
 from ansible.module_utils.six.moves.urllib.parse import urlencode, urljoin
-from ansible.module_utils.urls import Request
+from ansible.module_utils.urls import Request, basic_auth_header
+from ansible_collections.pulp.squeezer.plugins.module_utils.session_auth import PulpSession
+from ansible_collections.pulp.squeezer.plugins.module_utils.transport import (
+    RETRY_METHODS,
+    RETRY_STATUS,
+    backoff_time,
+    retry_after,
+)
 
 if six.PY2:
 
@@ -40,8 +52,15 @@ class OpenAPI:
         password=None,
         validate_certs=True,
         refresh_cache=False,
+        retries=0,
+        retry_backoff=0,
+        throttle=None,
+        session_auth=False,
     ):
         self.doc_path = doc_path
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.throttle = throttle
 
         if base_url.startswith("unix:"):
             self.unix_socket = base_url.replace("unix:", "")
@@ -54,13 +73,24 @@ class OpenAPI:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
-        self._session = Request(
-            url_username=username,
-            url_password=password,
-            headers=headers,
-            validate_certs=validate_certs,
-            force_basic_auth=True,
-        )
+        if session_auth and username is not None and self.unix_socket is None:
+            # Credentials are added per request, either as session cookie or as basic auth.
+            self.session_auth = PulpSession(self.base_url, username)
+            self._basic_auth = basic_auth_header(username, password)
+            self._session = Request(
+                headers=headers,
+                validate_certs=validate_certs,
+                use_netrc=False,
+            )
+        else:
+            self.session_auth = None
+            self._session = Request(
+                url_username=username,
+                url_password=password,
+                headers=headers,
+                validate_certs=validate_certs,
+                force_basic_auth=True,
+            )
 
         self.load_api(refresh_cache=refresh_cache)
 
@@ -103,11 +133,98 @@ class OpenAPI:
             if method in {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
         }
 
-    def _download_api(self):
+    def _open(self, method, url, **kwargs):
+        """
+        Send a request, retrying transient errors like the requests sessions of the glue client do.
+
+        Retries happen within one throttled request.
+        """
+        slot = self.throttle.acquire() if self.throttle is not None else None
+        try:
+            return self._retrying_open(method, url, **kwargs)
+        finally:
+            if self.throttle is not None:
+                self.throttle.release(slot)
+
+    def _retrying_open(self, method, url, **kwargs):
+        safe = method.upper() in RETRY_METHODS
+        retry = 0
+        while True:
+            try:
+                return self._send(method, url, **kwargs)
+            except HTTPError as e:
+                if not safe or e.code not in RETRY_STATUS or retry >= self.retries:
+                    raise
+                delay = retry_after(e.headers)
+            except URLError as e:
+                # Only a refused connection guarantees the request never reached the server.
+                if not (safe or isinstance(e.reason, ConnectionRefusedError)):
+                    raise
+                if retry >= self.retries:
+                    raise
+                delay = None
+            except (http_client.HTTPException, OSError):
+                # The connection broke after the request was sent.
+                if not safe or retry >= self.retries:
+                    raise
+                delay = None
+            retry += 1
+            time.sleep(backoff_time(self.retry_backoff, retry) if delay is None else delay)
+
+    def _send(self, method, url, headers=None, **kwargs):
+        if self.session_auth is None:
+            return self._session.open(
+                method, url, headers=headers, unix_socket=self.unix_socket, **kwargs
+            ).read()
+        if self.session_auth.session is None:
+            self._login()
+        try:
+            return self._session.open(
+                method, url, headers=self._auth_headers(method, headers), **kwargs
+            ).read()
+        except HTTPError as e:
+            if e.code not in (401, 403):
+                raise
+            body = e.read()
+            if not self.session_auth.rejected(e.code, body):
+                # The body was consumed; hand it on to whoever handles the error.
+                raise HTTPError(e.url, e.code, e.msg, e.hdrs, io.BytesIO(body))
+        # The session expired or was revoked. Log in anew and send the request again.
+        self.session_auth.forget()
+        self._login()
         return self._session.open(
-            "GET", urljoin(self.base_url, self.doc_path), unix_socket=self.unix_socket
+            method, url, headers=self._auth_headers(method, headers), **kwargs
         ).read()
 
+    def _auth_headers(self, method, headers):
+        auth_headers = self.session_auth.headers(method)
+        if auth_headers is None:
+            auth_headers = {"Authorization": self._basic_auth}
+        auth_headers.update(headers or {})
+        return auth_headers
+
+    def _login(self):
+        cookies = CookieJar()
+        try:
+            self._session.open(
+                "POST",
+                self.session_auth.login_url,
+                headers={"Authorization": self._basic_auth},
+                cookies=cookies,
+            ).read()
+        except HTTPError as e:
+            if e.code == 404:
+                self.session_auth.logged_in(e.code, [])
+            else:
+                self.session_auth.login_failed()
+        except (URLError, http_client.HTTPException, OSError):
+            self.session_auth.login_failed()
+        else:
+            self.session_auth.logged_in(200, cookies)
+
+    def _download_api(self):
+        return self._open("GET", urljoin(self.base_url, self.doc_path))
+
     def extract_params(self, param_type, path_spec, method_spec, params):
         param_spec = {
             entry["name"]: entry
@@ -236,9 +353,7 @@ class OpenAPI:
 
         data = self.render_body(path_spec, method_spec, headers, body, uploads)
 
-        result = self._session.open(
-            method, url, data=data, headers=headers, unix_socket=self.unix_socket
-        ).read()
+        result = self._open(method, url, data=data, headers=headers)
         if result:
             return json.loads(result)
         return None
@@ -19,6 +19,7 @@ from ansible.module_utils.basic import AnsibleModule, env_fallback
 # from ansible.module_utils.common import yaml
 from ansible.module_utils.six.moves.urllib.error import HTTPError
 from ansible_collections.pulp.squeezer.plugins.module_utils.openapi import OpenAPI
+from ansible_collections.pulp.squeezer.plugins.module_utils.throttle import Throttle
 
 PAGE_LIMIT = 20
 CONTENT_CHUNK_SIZE = 512 * 1024  # 1/2 MB
@@ -59,6 +60,15 @@ class PulpAnsibleModule(AnsibleModule):
                 fallback=(env_fallback, ["SQUEEZER_VALIDATE_CERTS"]),
             ),
             refresh_api_cache=dict(type="bool", default=False),
+            retries=dict(type="int", default=3, fallback=(env_fallback, ["SQUEEZER_RETRIES"])),
+            retry_backoff=dict(
+                type="float", default=1.0, fallback=(env_fallback, ["SQUEEZER_RETRY_BACKOFF"])
+            ),
+            api_rate_limit=dict(type="float", fallback=(env_fallback, ["SQUEEZER_API_RATE_LIMIT"])),
+            api_concurrency=dict(type="int", fallback=(env_fallback, ["SQUEEZER_API_CONCURRENCY"])),
+            session_auth=dict(
+                type="bool", default=False, fallback=(env_fallback, ["SQUEEZER_SESSION_AUTH"])
+            ),
         )
         argument_spec.update(kwargs.pop("argument_spec", {}))
         supports_check_mode = kwargs.pop("supports_check_mode", True)
@@ -76,10 +86,23 @@ class PulpAnsibleModule(AnsibleModule):
             password=self.params["password"],
             validate_certs=self.params["validate_certs"],
             refresh_cache=self.params["refresh_api_cache"],
+            retries=self.params["retries"],
+            retry_backoff=self.params["retry_backoff"],
+            throttle=self.throttle(),
+            session_auth=self.params["session_auth"],
         )
 
         return self
 
+    def throttle(self):
+        if self.params["api_rate_limit"] or self.params["api_concurrency"]:
+            return Throttle(
+                self.params["pulp_url"],
+                rate=self.params["api_rate_limit"],
+                concurrency=self.params["api_concurrency"],
+            )
+        return None
+
     def __exit__(self, exc_class, exc_value, tb):
         if exc_class is None:
             self.exit_json(changed=self._changed, **self._results)
@@ -1007,88 +1030,6 @@ class PulpPythonRepository(PulpRepository):
         )
 
 
-# RPM entities
-
-
-class PulpRpmDistribution(PulpEntity):
-    _list_id = "distributions_rpm_rpm_list"
-    _read_id = "distributions_rpm_rpm_read"
-    _create_id = "distributions_rpm_rpm_create"
-    _update_id = "distributions_rpm_rpm_update"
-    _partial_update_id = "distributions_rpm_rpm_partial_update"
-    _delete_id = "distributions_rpm_rpm_delete"
-
-    _name_singular = "distribution"
-    _name_plural = "distributions"
-
-    @property
-    def _href(self):
-        return (
-            "rpm_distribution_href"
-            if self.module.pulp_api.openapi_version == 2
-            else "rpm_rpm_distribution_href"
-        )
-
-
-class PulpRpmPublication(PulpEntity):
-    _list_id = "publications_rpm_rpm_list"
-    _read_id = "publications_rpm_rpm_read"
-    _create_id = "publications_rpm_rpm_create"
-    _delete_id = "publications_rpm_rpm_delete"
-
-    _name_singular = "publication"
-    _name_plural = "publications"
-
-    @property
-    def _href(self):
-        return (
-            "rpm_publication_href"
-            if self.module.pulp_api.openapi_version == 2
-            else "rpm_rpm_publication_href"
-        )
-
-
-class PulpRpmRemote(PulpRemote):
-    _list_id = "remotes_rpm_rpm_list"
-    _read_id = "remotes_rpm_rpm_read"
-    _create_id = "remotes_rpm_rpm_create"
-    _update_id = "remotes_rpm_rpm_update"
-    _partial_update_id = "remotes_rpm_rpm_partial_update"
-    _delete_id = "remotes_rpm_rpm_delete"
-
-    _name_singular = "remote"
-    _name_plural = "remotes"
-
-    @property
-    def _href(self):
-        return (
-            "rpm_remote_href"
-            if self.module.pulp_api.openapi_version == 2
-            else "rpm_rpm_remote_href"
-        )
-
-
-class PulpRpmRepository(PulpRepository):
-    _list_id = "repositories_rpm_rpm_list"
-    _read_id = "repositories_rpm_rpm_read"
-    _create_id = "repositories_rpm_rpm_create"
-    _update_id = "repositories_rpm_rpm_update"
-    _partial_update_id = "repositories_rpm_rpm_partial_update"
-    _delete_id = "repositories_rpm_rpm_delete"
-    _sync_id = "repositories_rpm_rpm_sync"
-
-    _name_singular = "repository"
-    _name_plural = "repositories"
-
-    @property
-    def _href(self):
-        return (
-            "rpm_repository_href"
-            if self.module.pulp_api.openapi_version == 2
-            else "rpm_rpm_repository_href"
-        )
-
-
 # Container entities
 
 
@@ -6,14 +6,29 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import re
+import time
 import traceback
+from datetime import datetime, timezone
+from importlib import import_module
 
 from ansible.module_utils.basic import AnsibleModule, env_fallback, missing_required_lib
+from ansible_collections.pulp.squeezer.plugins.module_utils.session_auth import SessionAuth
+from ansible_collections.pulp.squeezer.plugins.module_utils.throttle import Throttle
+from ansible_collections.pulp.squeezer.plugins.module_utils.transport import mount_adapter
 
 try:
     from packaging.requirements import SpecifierSet
     from pulp_glue.common import __version__ as pulp_glue_version
-    from pulp_glue.common.context import PulpContext, PulpException, PulpNoWait
+    from pulp_glue.common.context import (
+        PulpContext,
+        PulpDistributionContext,
+        PulpException,
+        PulpNoWait,
+        PulpPublicationContext,
+        PulpRemoteContext,
+        PulpRepositoryContext,
+    )
 
     GLUE_VERSION_SPEC = ">=0.20.0,<0.25"
     if not SpecifierSet(GLUE_VERSION_SPEC).contains(pulp_glue_version):
@@ -24,15 +39,92 @@ try:
     PULP_CLI_IMPORT_ERR = None
 except ImportError:
     PULP_CLI_IMPORT_ERR = traceback.format_exc()
+    ENTITY_KINDS = {}
 else:
+    # Generic glue contexts by the kind of entity used in entity type names like `file_repository`.
+    ENTITY_KINDS = {
+        "repository": PulpRepositoryContext,
+        "remote": PulpRemoteContext,
+        "distribution": PulpDistributionContext,
+        "publication": PulpPublicationContext,
+    }
 
     class PulpSqueezerContext(PulpContext):
+        # Waiting tasks per online worker at which dispatching new tasks is held back.
+        task_queue_ratio = None
+        # Seconds to wait for the task queue before giving up, None to use the task timeout.
+        task_queue_timeout = None
+        max_queue_backoff = 30
+        retries = 0
+        retry_backoff = 0
+        throttle = None
+        session_auth = None
+
+        @property
+        def api(self):
+            if self._api is None:
+                api = super().api
+                # The api specification itself is fetched before this can take effect.
+                mount_adapter(api._session, self.retries, self.retry_backoff, self.throttle)
+                if self.session_auth is not None:
+                    self.session_auth.attach(api._session)
+            return super().api
+
         def prompt(self, *args, **kwargs):
             pass
 
         def echo(self, *args, **kwargs):
             pass
 
+        def call(self, operation_id, *args, **kwargs):
+            if self.task_queue_ratio is not None and self._dispatches_task(operation_id):
+                self.wait_for_task_queue()
+            return super().call(operation_id, *args, **kwargs)
+
+        def _dispatches_task(self, operation_id):
+            method, path = self.api.operations[operation_id]
+            return "202" in self.api.api_spec["paths"][path][method]["responses"]
+
+        def wait_for_task_queue(self):
+            """
+            Block until the number of waiting tasks is below task_queue_ratio per online worker.
+
+            Give up once task_queue_timeout, or else the task timeout, has passed.
+            """
+            max_wait = self.task_queue_timeout
+            if max_wait is None and self.timeout:
+                max_wait = self.timeout.total_seconds()
+            started = time.monotonic()
+            backoff = 1
+            while True:
+                workers = len(self.call("status_read")["online_workers"])
+                waiting = self.call(
+                    "tasks_list",
+                    parameters={"state": "waiting", "limit": 1, "fields": ["pulp_href"]},
+                )["count"]
+                # Without any online workers, the task is queued like everything else.
+                if waiting < self.task_queue_ratio * max(workers, 1):
+                    return
+                remaining = None if max_wait is None else started + max_wait - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PulpNoWait(
+                        f"Waiting for the task queue timed out with {waiting} waiting tasks"
+                        f" and {workers} online workers."
+                    )
+                time.sleep(backoff if remaining is None else min(backoff, remaining))
+                backoff = min(backoff * 2, self.max_queue_backoff)
+
+    if SpecifierSet(">=0.24.0").contains(pulp_glue_version):
+        from pulp_glue.common.openapi import BasicAuthProvider
+
+        class SessionAuthProvider(BasicAuthProvider):
+            # Hand out the session auth wherever basic auth is accepted.
+            def __init__(self, session_auth):
+                self.session_auth = session_auth
+
+            def basic_auth(self):
+                return self.session_auth
+
 
 class SqueezerException(Exception):
     pass
@@ -41,6 +133,353 @@ class SqueezerException(Exception):
 __VERSION__ = "0.0.16-dev"
 
 
+def registered_context_class(base_class, plugin, resource_type):
+    """
+    Find the plugin specific subclass of a generic glue context by plugin and resource type.
+
+    Only the context module of that plugin is imported to populate the TYPE_REGISTRY of the base
+    class.
+    """
+    key = f"{plugin}:{resource_type}"
+    if key not in base_class.TYPE_REGISTRY:
+        try:
+            import_module(f"pulp_glue.{plugin}.context")
+        except ImportError:
+            pass
+    try:
+        return base_class.TYPE_REGISTRY[key]
+    except KeyError:
+        raise SqueezerException(f"The {base_class.ENTITY} type '{key}' is not supported.")
+
+
+def typed_context_class(base_class, pulp_href):
+    """
+    Find the plugin specific subclass of a generic glue context for an entity.
+
+    The plugin is parsed from the href.
+    """
+    match = re.search(base_class.HREF_PATTERN, pulp_href)
+    if match is None:
+        raise SqueezerException(f"Unable to identify the plugin of '{pulp_href}'.")
+    return registered_context_class(base_class, match.group("plugin"), match.group("resource_type"))
+
+
+def entity_kind(context_class):
+    """
+    Kind of entities of a glue context, e.g. `repository`, or None for other kinds of entities.
+    """
+    for kind, base_class in ENTITY_KINDS.items():
+        if issubclass(context_class, base_class):
+            return kind
+    return None
+
+
+def entity_type(context_class):
+    """
+    Name of the type of entities of a plugin specific glue context, e.g. `ansible_collection_remote`.
+
+    The resource type is left out if it equals the plugin, e.g. `file_repository`.
+    Return None for generic contexts and for contexts of other kinds of entities.
+    """
+    kind = entity_kind(context_class)
+    plugin = getattr(context_class, "PLUGIN", None)
+    if kind is None or plugin is None:
+        return None
+    if context_class.RESOURCE_TYPE == plugin:
+        return f"{plugin}_{kind}"
+    return f"{plugin}_{context_class.RESOURCE_TYPE}_{kind}"
+
+
+def entity_context_class(type_name):
+    """
+    Find the plugin specific glue context for an entity type name, e.g. `file_repository`.
+    """
+    plugin, _, rest = type_name.partition("_")
+    resource_type, _, kind = rest.rpartition("_")
+    if kind not in ENTITY_KINDS or not plugin:
+        raise SqueezerException(f"Invalid entity type '{type_name}'.")
+    return registered_context_class(ENTITY_KINDS[kind], plugin, resource_type or plugin)
+
+
+NAMES_PER_REQUEST = 50
+# Kinds of entities that modules can take from a snapshot instead of looking them up by name.
+SNAPSHOT_KINDS = ("repository", "remote", "distribution")
+
+
+def lookup_by_name(context, names):
+    """
+    Find entities by their names with as few list requests as possible. Return them by name.
+    """
+    entities = {}
+    names = sorted(set(names))
+    for i in range(0, len(names), NAMES_PER_REQUEST):
+        for entity in list_entities(context, {"name__in": names[i : i + NAMES_PER_REQUEST]}):
+            entities[entity["name"]] = entity
+    return entities
+
+
+def list_entities(context, parameters, page_size=100):
+    """
+    Iterate over all entities of a context matching the parameters.
+
+    In contrast to `context.list(limit=-1, ...)`, this follows all pages of the result.
+    A page size of -1 leaves it to the server.
+    """
+    payload = dict(parameters, limit=page_size, offset=0)
+    while True:
+        page = context.call("list", parameters=dict(payload, **context.scope))
+        yield from page["results"]
+        if page["next"] is None or not page["results"]:
+            break
+        payload["offset"] += len(page["results"])
+
+
+def check_concurrency(concurrency):
+    if concurrency < 1:
+        raise SqueezerException("'concurrency' must be at least 1.")
+
+
+def failed_for(action, errors):
+    """
+    Exception naming each item that failed by name with its error.
+    """
+    return SqueezerException(
+        f"{action} failed for "
+        + ", ".join(f"'{name}': {error}" for name, error in sorted(errors.items()))
+    )
+
+
+def run_tasks(pulp_ctx, items, dispatch, concurrency):
+    """
+    Call `dispatch` for each item by name, keeping at most `concurrency` of their tasks in flight.
+
+    `dispatch` returns the task it dispatched, or None if there was nothing to wait for.
+    All tasks in flight are polled with a single task list request.
+    Return the finished tasks and the errors by name.
+    """
+    pending = sorted(items.items(), key=lambda item: item[0], reverse=True)
+    in_flight = {}
+    finished = {}
+    errors = {}
+    while pending or in_flight:
+        while pending and len(in_flight) < concurrency:
+            name, item = pending.pop()
+            try:
+                task = dispatch(item)
+            except (PulpException, SqueezerException) as e:
+                errors[name] = str(e)
+                continue
+            if task is None:
+                finished[name] = None
+            else:
+                in_flight[task["pulp_href"]] = (name, time.monotonic())
+        if not in_flight:
+            continue
+
+        time.sleep(1)
+        tasks = pulp_ctx.call(
+            "tasks_list",
+            parameters={
+                "pulp_href__in": list(in_flight),
+                "state__in": ["completed", "failed", "canceled"],
+                "limit": len(in_flight),
+            },
+        )["results"]
+        for task in tasks:
+            name, _ = in_flight.pop(task["pulp_href"])
+            if task["state"] == "completed":
+                finished[name] = task
+            else:
+                errors[name] = (task.get("error") or {}).get("description") or task["state"]
+        for task_href, (name, started) in in_flight.items():
+            if pulp_ctx.timeout and time.monotonic() - started > pulp_ctx.timeout.total_seconds():
+                raise PulpNoWait(f"Waiting for the task {task_href} of '{name}' timed out.")
+    return finished, errors
+
+
+def dispatched_task(result):
+    """
+    The task of an api call made with `non_blocking`, or None if the call finished right away.
+    """
+    if isinstance(result, dict) and "/tasks/" in result.get("pulp_href", ""):
+        return result
+    return None
+
+
+def parse_datetime(value):
+    """
+    Timezone aware datetime of a timestamp returned by the api.
+    """
+    # Python < 3.11 does not know the "Z" suffix.
+    result = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=timezone.utc)
+    return result
+
+
+def select_by_label(context, pulp_label_select):
+    """
+    Find all entities of a context matching a label selector. Return them by name.
+    """
+    return {
+        entity["name"]: entity
+        for entity in list_entities(context, {"pulp_label_select": pulp_label_select})
+    }
+
+
+def find_publication(publication_ctx, repository_version_href, attributes):
+    """
+    Find a publication of the repository version that matches the attributes, if any.
+    """
+    for publication in publication_ctx.call(
+        "list",
+        parameters={"repository_version": repository_version_href, "limit": 100},
+    )["results"]:
+        if all(publication.get(key) == value for key, value in attributes.items()):
+            return publication
+    return None
+
+
+def sync_selected(module, repository_class):
+    """
+    Sync all repositories matching `pulp_label_select` from the remotes configured on them.
+    """
+    check_concurrency(module.params["concurrency"])
+    repository_ctx = repository_class(module.pulp_ctx)
+    repositories = select_by_label(repository_ctx, module.params["pulp_label_select"])
+    without_remote = sorted(
+        name for name, repository in repositories.items() if not repository["remote"]
+    )
+    if without_remote:
+        raise SqueezerException(
+            f"No remote preconfigured on the repositories: {', '.join(without_remote)}."
+        )
+    results = {name: repository["latest_version_href"] for name, repository in repositories.items()}
+    # In check_mode, assume nothing changed
+    if not module.check_mode:
+        finished, errors = run_tasks(
+            module.pulp_ctx,
+            repositories,
+            lambda repository: repository_ctx.call(
+                "sync",
+                non_blocking=True,
+                parameters={repository_ctx.HREF: repository["pulp_href"]},
+                body={},
+            ),
+            module.params["concurrency"],
+        )
+        for name, task in finished.items():
+            if task["created_resources"]:
+                module.set_changed()
+                results[name] = task["created_resources"][0]
+        if errors:
+            module.set_result("repositories", dict(sorted(results.items())))
+            raise failed_for("Sync", errors)
+    module.set_result("repositories", dict(sorted(results.items())))
+
+
+def publish_selected(module, repository_class, desired_attributes):
+    """
+    Make sure a publication of the latest version of each repository matching `pulp_label_select`
+    exists.
+    """
+    if module.state != "present":
+        raise SqueezerException("'pulp_label_select' can only be used with state 'present'.")
+    check_concurrency(module.params["concurrency"])
+    repositories = select_by_label(
+        repository_class(module.pulp_ctx), module.params["pulp_label_select"]
+    )
+    results = {}
+    unpublished = {}
+    for name, repository in repositories.items():
+        publication = find_publication(
+            module.context, repository["latest_version_href"], desired_attributes
+        )
+        if publication is None:
+            unpublished[name] = repository
+            results[name] = None
+        else:
+            results[name] = publication["pulp_href"]
+    if unpublished:
+        module.set_changed()
+    if unpublished and not module.check_mode:
+        finished, errors = run_tasks(
+            module.pulp_ctx,
+            unpublished,
+            lambda repository: module.context.create(
+                body={
+                    **desired_attributes,
+                    "repository_version": repository["latest_version_href"],
+                },
+                non_blocking=True,
+            ),
+            module.params["concurrency"],
+        )
+        for name, task in finished.items():
+            results[name] = task["created_resources"][0]
+        if errors:
+            module.set_result("repositories", dict(sorted(results.items())))
+            raise failed_for("Publishing", errors)
+    module.set_result("repositories", dict(sorted(results.items())))
+
+
+def pulp_context(params, check_mode=False, session_auth=None):
+    """
+    Create the glue context for the connection parameters common to all modules.
+
+    Contexts given the same `session_auth` share its session and log in only once.
+    """
+    auth_args = {}
+    if SpecifierSet(">=0.24.0").contains(pulp_glue_version):
+        if params["username"]:
+            if params["session_auth"]:
+                if session_auth is None:
+                    session_auth = SessionAuth(
+                        params["pulp_url"],
+                        params["username"],
+                        params["password"],
+                        timeout=params["timeout"],
+                    )
+                auth_args["auth_provider"] = SessionAuthProvider(session_auth)
+            else:
+                auth_args["auth_provider"] = BasicAuthProvider(
+                    username=params["username"],
+                    password=params["password"],
+                )
+    else:
+        auth_args["username"] = params["username"]
+        auth_args["password"] = params["password"]
+
+    pulp_ctx = PulpSqueezerContext(
+        api_root="/pulp/",
+        api_kwargs=dict(
+            base_url=params["pulp_url"],
+            cert=params["user_cert"],
+            key=params["user_key"],
+            validate_certs=params["validate_certs"],
+            refresh_cache=params["refresh_api_cache"],
+            safe_calls_only=check_mode,
+            user_agent=f"Squeezer/{__VERSION__}",
+            **auth_args,
+        ),
+        background_tasks=False,
+        timeout=params["timeout"],
+    )
+    pulp_ctx.retries = params["retries"]
+    pulp_ctx.retry_backoff = params["retry_backoff"]
+    pulp_ctx.session_auth = session_auth
+    if params["api_rate_limit"] or params["api_concurrency"]:
+        pulp_ctx.throttle = Throttle(
+            params["pulp_url"],
+            rate=params["api_rate_limit"],
+            concurrency=params["api_concurrency"],
+        )
+    if not check_mode:
+        pulp_ctx.task_queue_ratio = params["task_queue_ratio"]
+        pulp_ctx.task_queue_timeout = params["task_queue_timeout"]
+    return pulp_ctx
+
+
 class PulpAnsibleModule(AnsibleModule):
     def __init__(self, **kwargs):
         argument_spec = dict(
@@ -60,6 +499,21 @@ class PulpAnsibleModule(AnsibleModule):
             ),
             refresh_api_cache=dict(type="bool", default=False),
             timeout=dict(type="int", default=10),
+            task_queue_ratio=dict(
+                type="float", fallback=(env_fallback, ["SQUEEZER_TASK_QUEUE_RATIO"])
+            ),
+            task_queue_timeout=dict(
+                type="int", fallback=(env_fallback, ["SQUEEZER_TASK_QUEUE_TIMEOUT"])
+            ),
+            retries=dict(type="int", default=3, fallback=(env_fallback, ["SQUEEZER_RETRIES"])),
+            retry_backoff=dict(
+                type="float", default=1.0, fallback=(env_fallback, ["SQUEEZER_RETRY_BACKOFF"])
+            ),
+            api_rate_limit=dict(type="float", fallback=(env_fallback, ["SQUEEZER_API_RATE_LIMIT"])),
+            api_concurrency=dict(type="int", fallback=(env_fallback, ["SQUEEZER_API_CONCURRENCY"])),
+            session_auth=dict(
+                type="bool", default=False, fallback=(env_fallback, ["SQUEEZER_SESSION_AUTH"])
+            ),
         )
         argument_spec.update(kwargs.pop("argument_spec", {}))
         if not kwargs.pop("no_auth", False):
@@ -85,34 +539,12 @@ class PulpAnsibleModule(AnsibleModule):
             if import_error[1] is not None:
                 self.fail_json(msg=missing_required_lib(import_error[0]), exception=import_error[1])
 
-        auth_args = {}
-        if SpecifierSet(">=0.24.0").contains(pulp_glue_version):
-            if self.params["username"]:
-                from pulp_glue.common.openapi import BasicAuthProvider
-
-                auth_args["auth_provider"] = BasicAuthProvider(
-                    username=self.params["username"],
-                    password=self.params["password"],
-                )
-        else:
-            auth_args["username"] = self.params["username"]
-            auth_args["password"] = self.params["password"]
-
-        self.pulp_ctx = PulpSqueezerContext(
-            api_root="/pulp/",
-            api_kwargs=dict(
-                base_url=self.params["pulp_url"],
-                cert=self.params["user_cert"],
-                key=self.params["user_key"],
-                validate_certs=self.params["validate_certs"],
-                refresh_cache=self.params["refresh_api_cache"],
-                safe_calls_only=self.check_mode,
-                user_agent=f"Squeezer/{__VERSION__}",
-                **auth_args,
-            ),
-            background_tasks=False,
-            timeout=self.params["timeout"],
-        )
+        if self.params["session_auth"] and not SpecifierSet(">=0.24.0").contains(pulp_glue_version):
+            self.warn(
+                f"'session_auth' needs pulp-glue 0.24.0 or later, pulp-glue {pulp_glue_version}"
+                " sends the password with every request."
+            )
+        self.pulp_ctx = pulp_context(self.params, check_mode=self.check_mode)
 
     def __enter__(self):
         self._changed = False
@@ -125,7 +557,7 @@ class PulpAnsibleModule(AnsibleModule):
             self.exit_json(changed=self._changed, **self._results)
         else:
             if issubclass(exc_class, (PulpException, PulpNoWait, SqueezerException)):
-                self.fail_json(msg=str(exc_value), changed=self._changed)
+                self.fail_json(msg=str(exc_value), changed=self._changed, **self._results)
                 return True
             elif issubclass(exc_class, Exception):
                 self.fail_json(
@@ -143,18 +575,45 @@ class PulpAnsibleModule(AnsibleModule):
 
 
 class PulpEntityAnsibleModule(PulpAnsibleModule):
-    def __init__(self, context_class, entity_singular, entity_plural, **kwargs):
+    def __init__(
+        self,
+        context_class,
+        entity_singular,
+        entity_plural,
+        canonicalizers=None,
+        deprecated_plural=None,
+        **kwargs,
+    ):
         argument_spec = dict(
             state=dict(
                 choices=["present", "absent"],
             ),
         )
+        if PULP_CLI_IMPORT_ERR is None and context_class is not None:
+            # Only entities looked up by name can be taken from a snapshot.
+            if entity_kind(context_class) in SNAPSHOT_KINDS:
+                argument_spec["snapshot"] = dict(type="dict")
         argument_spec.update(kwargs.pop("argument_spec", {}))
         super().__init__(argument_spec=argument_spec, **kwargs)
         self.state = self.params["state"]
         self.context = context_class(self.pulp_ctx)
         self.entity_singular = entity_singular
         self.entity_plural = entity_plural
+        # Key the list of entities was returned under before, still returned alongside.
+        self.deprecated_plural = deprecated_plural
+        # Functions by attribute name to bring values into a form that compares semantically.
+        self.canonicalizers = canonicalizers or {}
+
+    def canonical(self, key, value):
+        canonicalize = self.canonicalizers.get(key)
+        if canonicalize is None or value is None:
+            return value
+        return canonicalize(value)
+
+    def set_entities_result(self, entities):
+        self.set_result(self.entity_plural, entities)
+        if self.deprecated_plural is not None:
+            self.set_result(self.deprecated_plural, entities)
 
     def represent(self, entity):
         return {
@@ -162,16 +621,42 @@ class PulpEntityAnsibleModule(PulpAnsibleModule):
             for key, value in entity.items()
         }
 
+    def snapshot_entities(self):
+        """
+        Entities of this module's type by href from the snapshot given for this server, if any.
+        """
+        snapshot = self.params.get("snapshot")
+        if not snapshot or snapshot.get("pulp_url") != self.params["pulp_url"]:
+            return None
+        snapshot_type = snapshot.get("types", {}).get(entity_type(type(self.context)))
+        return snapshot_type and snapshot_type["entities"]
+
+    def find(self, natural_key):
+        snapshot_entities = self.snapshot_entities()
+        # An entity to delete may be gone since the snapshot was taken, so it is looked up.
+        if (
+            snapshot_entities is not None
+            and list(natural_key) == ["name"]
+            and self.state != "absent"
+        ):
+            for entity in snapshot_entities.values():
+                if entity.get("name") == natural_key["name"]:
+                    # The entity is only fetched again if it needs to be changed.
+                    self.context.pulp_href = entity["pulp_href"]
+                    return self.represent(entity)
+        # Entities missing in the snapshot may have been created after it was taken.
+        if "pulp_href" in natural_key:
+            self.context.pulp_href = natural_key["pulp_href"]
+        else:
+            self.context.entity = natural_key
+        try:
+            return self.represent(self.context.entity)
+        except PulpException:
+            return None
+
     def process(self, natural_key, desired_attributes):
         if None not in natural_key.values():
-            if "pulp_href" in natural_key:
-                self.context.pulp_href = natural_key["pulp_href"]
-            else:
-                self.context.entity = natural_key
-            try:
-                entity = self.represent(self.context.entity)
-            except PulpException:
-                entity = None
+            entity = self.find(natural_key)
             if self.state is None:
                 pass
             elif self.state == "absent":
@@ -185,14 +670,70 @@ class PulpEntityAnsibleModule(PulpAnsibleModule):
             else:
                 entity = self.process_special(entity, natural_key, desired_attributes)
             self.set_result(self.entity_singular, entity)
+        elif self.params.get("pulp_label_select") is not None:
+            self.process_selected(desired_attributes)
         else:
             if self.state is not None:
                 raise SqueezerException(f"Invalid state '{self.state}' for entity listing.")
             entities = [
-                self.represent(entity)
-                for entity in self.context.list(limit=-1, offset=0, parameters={})
+                self.represent(entity) for entity in list_entities(self.context, {}, page_size=-1)
             ]
-            self.set_result(self.entity_plural, entities)
+            self.set_entities_result(entities)
+
+    def process_selected(self, desired_attributes):
+        """
+        Bring all entities matching `pulp_label_select` into the state, running their tasks
+        concurrently.
+
+        With state present, existing entities are updated. No entities are created.
+        """
+        check_concurrency(self.params["concurrency"])
+        entities = select_by_label(self.context, self.params["pulp_label_select"])
+        if self.state is None:
+            changes = {}
+        elif self.state == "absent":
+            changes = {name: None for name in entities}
+        elif self.state == "present":
+            changes = {}
+            for name, entity in entities.items():
+                updated_attributes = {
+                    k: v
+                    for k, v in desired_attributes.items()
+                    if self.canonical(k, self.represent(entity).get(k)) != self.canonical(k, v)
+                }
+                if updated_attributes:
+                    changes[name] = updated_attributes
+        else:
+            raise SqueezerException(f"Invalid state '{self.state}' for selected entities.")
+        if changes:
+            self.set_changed()
+
+        if changes and not self.check_mode:
+
+            def dispatch(name):
+                if changes[name] is None:
+                    result = self.context.delete(entities[name]["pulp_href"], non_blocking=True)
+                else:
+                    result = self.context.update(
+                        entities[name]["pulp_href"], body=changes[name], non_blocking=True
+                    )
+                return dispatched_task(result)
+
+            _, errors = run_tasks(
+                self.pulp_ctx,
+                {name: name for name in changes},
+                dispatch,
+                self.params["concurrency"],
+            )
+            if errors:
+                raise failed_for(f"Changing the {self.entity_plural}", errors)
+
+        if self.state == "absent":
+            entities = {}
+        else:
+            for name, updated_attributes in changes.items():
+                entities[name] = dict(entities[name], **updated_attributes)
+        self.set_entities_result([self.represent(entity) for _, entity in sorted(entities.items())])
 
     def process_present(self, entity, natural_key, desired_attributes):
         if entity is None:
@@ -203,7 +744,11 @@ class PulpEntityAnsibleModule(PulpAnsibleModule):
             entity = self.represent(entity)
             self.set_changed()
         else:
-            updated_attributes = {k: v for k, v in desired_attributes.items() if entity.get(k) != v}
+            updated_attributes = {
+                k: v
+                for k, v in desired_attributes.items()
+                if self.canonical(k, entity.get(k)) != self.canonical(k, v)
+            }
             if updated_attributes:
                 if not self.check_mode:
                     self.context.update(body=updated_attributes)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import errno
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ansible.module_utils.six.moves.urllib.parse import urljoin
+
+try:
+    import requests
+    from requests.auth import AuthBase, HTTPBasicAuth
+except ImportError:
+    requests = None
+    AuthBase = object
+
+LOGIN_PATH = "/pulp/api/v3/login/"
+# Lifetime assumed for a session cookie without an expiry.
+DEFAULT_SESSION_AGE = 3600
+# How long to remember that a server does not offer a login endpoint.
+UNSUPPORTED_AGE = 24 * 3600
+SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+def session_cache_path(base_url, username):
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return os.path.join(
+        os.path.expanduser(xdg_cache_home),
+        "squeezer",
+        base_url.replace(":", "_").replace("/", "_"),
+        "sessions",
+        hashlib.sha256(username.encode("utf-8")).hexdigest() + ".json",
+    )
+
+
+class PulpSession:
+    """
+    A Pulp session cookie, cached together with its expiry per server and user.
+
+    This holds the state shared by the clients. Each client logs in and sends requests its own way.
+    """
+
+    def __init__(self, base_url, username):
+        self.base_url = base_url
+        self.login_url = urljoin(base_url, LOGIN_PATH)
+        self.cache_path = session_cache_path(base_url, username)
+        self.session = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as cache_file:
+                session = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if session.get("expires", 0) <= time.time():
+            return None
+        return session
+
+    def _store(self, session):
+        directory = os.path.dirname(self.cache_path)
+        try:
+            os.makedirs(directory, 0o700)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+        tmp_path = "{0}.{1}".format(self.cache_path, os.getpid())
+        # The session id is a credential.
+        fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as cache_file:
+            json.dump(session, cache_file)
+        os.rename(tmp_path, self.cache_path)
+        self.session = session
+
+    def forget(self):
+        self.session = None
+        try:
+            os.remove(self.cache_path)
+        except OSError:
+            pass
+
+    def login_failed(self):
+        # Stick to basic auth for the lifetime of this object.
+        self.session = {"unsupported": True}
+
+    def logged_in(self, status, cookies):
+        """
+        Record the outcome of a login from the response status and the cookies it set.
+        """
+        now = time.time()
+        if status == 404:
+            # Older servers have no login endpoint. Do not try again for a while.
+            self._store({"unsupported": True, "expires": now + UNSUPPORTED_AGE})
+            return
+        cookies = list(cookies)
+        session_cookies = [cookie for cookie in cookies if cookie.name == "sessionid"]
+        if not 200 <= status < 300 or not session_cookies:
+            self.login_failed()
+            return
+        csrf_cookies = [cookie for cookie in cookies if cookie.name == "csrftoken"]
+        self._store(
+            {
+                "sessionid": session_cookies[0].value,
+                "csrftoken": csrf_cookies[0].value if csrf_cookies else None,
+                "expires": min(
+                    cookie.expires or now + DEFAULT_SESSION_AGE for cookie in session_cookies
+                ),
+            }
+        )
+
+    def headers(self, method, session=None):
+        """
+        Return the headers authenticating a request with the session, or None to use basic auth.
+        """
+        if session is None:
+            session = self.session
+        if session.get("unsupported"):
+            return None
+        headers = {}
+        cookies = ["sessionid=" + session["sessionid"]]
+        if session.get("csrftoken"):
+            cookies.append("csrftoken=" + session["csrftoken"])
+            if method.upper() not in SAFE_METHODS:
+                headers["X-CSRFToken"] = session["csrftoken"]
+                # Django checks the referer of unsafe requests over https.
+                headers["Referer"] = self.base_url
+        headers["Cookie"] = "; ".join(cookies)
+        return headers
+
+    @staticmethod
+    def rejected(status, body):
+        """
+        Tell whether the server rejected the session, because it expired or was revoked.
+        """
+        return status == 401 or (status == 403 and b"CSRF" in body)
+
+
+class SessionAuth(PulpSession, AuthBase):
+    """
+    Authenticate requests with a Pulp session cookie instead of verifying the password every time.
+
+    The session is obtained once by logging in with basic auth and reused across requests and
+    module runs. If the server rejects the session, a new one is obtained and the request is sent
+    again. Without a session, e.g. if the server has no login endpoint, requests use basic auth.
+
+    Logging in needs the requests session of the client, so the login is sent with its settings
+    and adapters. Until it is attached, requests use basic auth.
+    """
+
+    def __init__(self, base_url, username, password, timeout=None):
+        super(SessionAuth, self).__init__(base_url, username)
+        self.basic_auth = HTTPBasicAuth(username, password)
+        self.timeout = timeout
+        self.http_session = None
+        # Concurrent requests share the session and must log in only once.
+        self.lock = threading.Lock()
+
+    def attach(self, http_session):
+        # Clients sharing this log in through the one attached first.
+        if self.http_session is None:
+            self.http_session = http_session
+
+    def login(self):
+        self.login_failed()
+        try:
+            response = self.http_session.post(
+                self.login_url, auth=self.basic_auth, timeout=self.timeout
+            )
+        except requests.RequestException:
+            return
+        # The session is sent explicitly, keep it out of the cookie jar of the client.
+        for cookie in response.cookies:
+            try:
+                self.http_session.cookies.clear(cookie.domain, cookie.path, cookie.name)
+            except KeyError:
+                pass
+        self.logged_in(response.status_code, response.cookies)
+
+    def _apply_session(self, request, session):
+        if session is None:
+            return False
+        headers = self.headers(request.method, session)
+        if headers is None:
+            return False
+        request.headers.update(headers)
+        return True
+
+    def __call__(self, request):
+        with self.lock:
+            if self.session is None and self.http_session is not None:
+                self.login()
+            session = self.session
+        if self._apply_session(request, session):
+
+            def handle_rejected(response, **kwargs):
+                return self.handle_rejected(session, response, **kwargs)
+
+            request.register_hook("response", handle_rejected)
+        else:
+            self.basic_auth(request)
+        return request
+
+    def handle_rejected(self, session, response, **kwargs):
+        if not self.rejected(response.status_code, response.content):
+            return response
+        with self.lock:
+            # Log in anew, unless another request already replaced the rejected session.
+            if self.session is session:
+                self.forget()
+                self.login()
+            session = self.session
+        response.close()
+        request = response.request.copy()
+        for header in ("Cookie", "X-CSRFToken", "Referer"):
+            request.headers.pop(header, None)
+        if not self._apply_session(request, session):
+            self.basic_auth(request)
+        retry = response.connection.send(request, **kwargs)
+        retry.history.append(response)
+        retry.request = request
+        return retry
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import errno
+import fcntl
+import json
+import os
+import time
+
+SLOT_POLL_INTERVAL = 0.05
+
+
+def throttle_dir(base_url):
+    """The directory shared by all processes talking to the same server."""
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return os.path.join(
+        os.path.expanduser(xdg_cache_home),
+        "squeezer",
+        base_url.replace(":", "_").replace("/", "_"),
+        "throttle",
+    )
+
+
+class Throttle:
+    """
+    Limit the request rate and the number of concurrent requests to a server across processes.
+
+    The rate is a token bucket holding up to one second worth of requests, kept in a state file.
+    Concurrency is limited by a number of slot files, each locked by the request using it.
+    All state is guarded by `flock`, so it is shared by all forks of a playbook run on a host and
+    locks held by a process that died are released by the kernel.
+    Call `acquire` before and `release` after each request. This is safe to share between threads.
+    """
+
+    def __init__(self, base_url, rate=None, concurrency=None):
+        self.path = throttle_dir(base_url)
+        self.rate = rate
+        self.concurrency = concurrency
+        try:
+            os.makedirs(self.path)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+
+    def acquire(self):
+        """Wait for a free slot and a token. Return the slot to release."""
+        slot = self._acquire_slot() if self.concurrency else None
+        if self.rate:
+            self._take_token()
+        return slot
+
+    def release(self, slot):
+        if slot is not None:
+            # Closing the file releases the lock.
+            os.close(slot)
+
+    def _acquire_slot(self):
+        while True:
+            for index in range(self.concurrency):
+                fd = os.open(
+                    os.path.join(self.path, "slot-{0}".format(index)), os.O_CREAT | os.O_RDWR
+                )
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except (IOError, OSError):
+                    os.close(fd)
+                else:
+                    return fd
+            time.sleep(SLOT_POLL_INTERVAL)
+
+    def _take_token(self):
+        capacity = max(self.rate, 1)
+        fd = os.open(os.path.join(self.path, "bucket"), os.O_CREAT | os.O_RDWR)
+        try:
+            while True:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    now = time.time()
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    try:
+                        state = json.loads(os.read(fd, 4096).decode())
+                    except ValueError:
+                        state = {"tokens": capacity, "time": now}
+                    tokens = min(
+                        capacity, state["tokens"] + max(now - state["time"], 0) * self.rate
+                    )
+                    if tokens >= 1:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        os.ftruncate(fd, 0)
+                        os.write(fd, json.dumps({"tokens": tokens - 1, "time": now}).encode())
+                        return
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                time.sleep((1 - tokens) / self.rate)
+        finally:
+            os.close(fd)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import random
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+try:
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    HTTPAdapter = None
+    Retry = object
+
+# Responses of an overloaded or restarting server, worth trying again.
+RETRY_STATUS = frozenset([429, 502, 503, 504])
+# Only requests that can safely be sent twice are retried after a response was received.
+RETRY_METHODS = frozenset(["GET", "HEAD"])
+
+
+class JitterRetry(Retry):
+    """
+    Retry with exponential backoff, of which a random part is waited.
+
+    This keeps many clients that failed at the same time from retrying in lockstep.
+    A Retry-After header of the server takes precedence.
+    """
+
+    def get_backoff_time(self):
+        return jittered(super(JitterRetry, self).get_backoff_time())
+
+
+def jittered(backoff):
+    return random.uniform(backoff / 2, backoff)
+
+
+def backoff_time(backoff, retry):
+    """
+    Return the pause before a retry, growing like the one of `JitterRetry`.
+    """
+    return jittered(backoff * 2 ** (retry - 1))
+
+
+def retry_after(headers):
+    """
+    Return the seconds a Retry-After header asks to wait, or None.
+    """
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, mktime_tz(date) - time.time())
+
+
+if HTTPAdapter is not None:
+
+    class ThrottledAdapter(HTTPAdapter):
+        """
+        A transport adapter sending every request within a `Throttle`.
+        """
+
+        def __init__(self, throttle, **kwargs):
+            super(ThrottledAdapter, self).__init__(**kwargs)
+            self.throttle = throttle
+
+        def send(self, request, **kwargs):
+            slot = self.throttle.acquire()
+            try:
+                return super(ThrottledAdapter, self).send(request, **kwargs)
+            finally:
+                self.throttle.release(slot)
+
+
+def mount_adapter(session, retries=0, backoff=0, throttle=None):
+    """
+    Configure a requests session to retry transient errors and to respect a `Throttle`.
+
+    Failing to connect is retried for all requests, as these never reached the server.
+    Read errors and error responses are only retried for safe methods. Once the retries are
+    exhausted, the last response is returned to be handled like any other.
+    Retries happen within the throttled request.
+    """
+    if HTTPAdapter is None or not (retries or throttle):
+        return
+    kwargs = {}
+    if retries:
+        kwargs["max_retries"] = JitterRetry(
+            total=retries,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=RETRY_METHODS,
+            backoff_factor=backoff,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+    if throttle is not None:
+        # Allow as many pooled connections as concurrent requests are allowed.
+        if throttle.concurrency:
+            kwargs["pool_maxsize"] = max(throttle.concurrency, 10)
+        adapter = ThrottledAdapter(throttle, **kwargs)
+    else:
+        adapter = HTTPAdapter(**kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
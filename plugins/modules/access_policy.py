@@ -125,6 +125,7 @@ RETURN = r"""
 
 import traceback
 
+from ansible_collections.pulp.squeezer.plugins.module_utils.canonical import unordered_list
 from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpEntityAnsibleModule
 
 try:
@@ -136,11 +137,26 @@ except ImportError:
     PulpAccessPolicyContext = None
 
 
+def canonical_statements(statements):
+    # Neither the order of the statements nor of their actions changes the policy.
+    return unordered_list(
+        [
+            (
+                dict(statement, action=sorted(statement["action"]))
+                if isinstance(statement.get("action"), list)
+                else statement
+            )
+            for statement in statements
+        ]
+    )
+
+
 def main():
     with PulpEntityAnsibleModule(
         context_class=PulpAccessPolicyContext,
         entity_singular="access_policy",
         entity_plural="access_policies",
+        canonicalizers={"statements": canonical_statements, "creation_hooks": unordered_list},
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             viewset_name=dict(),
@@ -56,6 +56,7 @@ options:
 extends_documentation_fragment:
   - pulp.squeezer.pulp.remote
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.snapshot
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -162,6 +163,7 @@ class PulpAnsibleRemoteAnsibleModule(PulpRemoteAnsibleModule):
 def main():
     with PulpAnsibleRemoteAnsibleModule(
         context_class=PulpRemoteContext,
+        canonicalizers={"requirements_file": collections_down},
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             content_type=dict(choices=["collection", "role"], default="collection"),
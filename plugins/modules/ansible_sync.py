@@ -16,6 +16,7 @@ short_description: Synchronize a ansible remote on a pulp server
 description:
   - "This module synchronizes a ansible remote into a repository."
   - "In check_mode this module assumes, nothing changed upstream."
+  - "With I(pulp_label_select), all matching repositories are synchronized from the remotes configured on them, and I(remote) cannot be used."
 options:
   content_type:
     description:
@@ -33,11 +34,13 @@ options:
   repository:
     description:
       - Name of the repository
+      - Exactly one of I(repository) and I(pulp_label_select) is required.
     type: str
-    required: true
+    required: false
   timeout:
     default: 3600
 extends_documentation_fragment:
+  - pulp.squeezer.pulp.label_select
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -62,7 +65,12 @@ RETURN = r"""
   repository_version:
     description: Repository version after synching
     type: dict
-    returned: always
+    returned: when repository is given
+  repositories:
+    description: Repository version after synching by the name of each selected repository
+    type: dict
+    returned: when pulp_label_select is given
+    version_added: "0.0.16"
 """
 
 
@@ -71,6 +79,7 @@ import traceback
 from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
     PulpAnsibleModule,
     SqueezerException,
+    sync_selected,
 )
 
 try:
@@ -91,10 +100,18 @@ def main():
         argument_spec=dict(
             content_type=dict(choices=["collection", "role"], default="collection"),
             remote=dict(required=False),
-            repository=dict(required=True),
+            repository=dict(),
+            pulp_label_select=dict(),
+            concurrency=dict(type="int", default=4),
             timeout=dict(type="int", default=3600),
         ),
+        required_one_of=[("repository", "pulp_label_select")],
+        mutually_exclusive=[("repository", "pulp_label_select"), ("remote", "pulp_label_select")],
     ) as module:
+        if module.params["pulp_label_select"] is not None:
+            sync_selected(module, PulpAnsibleRepositoryContext)
+            return
+
         if module.params["content_type"] == "collection":
             remote_context_class = PulpAnsibleCollectionRemoteContext
         else:
@@ -17,9 +17,11 @@ description:
   - "TBD"
 options:
   operation_id:
-    description: "ID of the openapi operation to perform."
+    description:
+      - "ID of the openapi operation to perform."
+      - Exactly one of I(operation_id) and I(operations) is required.
     type: str
-    required: true
+    required: false
   parameters:
     description: "Dictionary of (path, query and cookie) parameters to send along with the request."
     type: dict
@@ -28,6 +30,62 @@ options:
     description: "JSON representation of the body to send in the request (only POST, PUT and PATCH requests.)"
     type: dict
     required: false
+  paginate:
+    description:
+      - Follow all pages of a list operation.
+      - The C(limit) parameter is used as the page size, the C(offset) parameter as the start.
+      - The results of all pages are combined into the C(results) of the response, unless I(dest) is given.
+    type: bool
+    default: false
+    version_added: "0.0.16"
+  max_results:
+    description:
+      - Stop paginating after this many results.
+    type: int
+    required: false
+    version_added: "0.0.16"
+  dest:
+    description:
+      - Write the results of all pages to this file as JSON Lines, one entity per line, instead of returning them.
+      - Requires I(paginate).
+    type: path
+    required: false
+    version_added: "0.0.16"
+  operations:
+    description:
+      - List of operations to perform in one module invocation, instead of I(operation_id), I(parameters) and I(body).
+      - Failing operations do not stop the others. The module fails after all of them were tried.
+    type: list
+    elements: dict
+    required: false
+    version_added: "0.0.16"
+    suboptions:
+      operation_id:
+        description: "ID of the openapi operation to perform."
+        type: str
+        required: true
+      parameters:
+        description: "Dictionary of (path, query and cookie) parameters to send along with the request."
+        type: dict
+        required: false
+      body:
+        description: "JSON representation of the body to send in the request."
+        type: dict
+        required: false
+  concurrency:
+    description:
+      - Number of I(operations) to perform at the same time.
+      - Each of the operations performed at the same time uses its own connection to the server.
+    type: int
+    default: 4
+    version_added: "0.0.16"
+  wait:
+    description:
+      - Whether to wait for the tasks spawned by I(operations) to finish.
+      - If not, the response of such an operation is the task as it was right after dispatching.
+    type: bool
+    default: true
+    version_added: "0.0.16"
 extends_documentation_fragment:
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
@@ -45,37 +103,239 @@ EXAMPLES = r"""
 - name: Report pulp status
   debug:
     var: pulp_result.response
+- name: Export all file content units
+  pulp.squeezer.api_call:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    operation_id: content_file_files_list
+    parameters:
+      limit: 1000
+      fields:
+        - pulp_href
+        - relative_path
+        - sha256
+    paginate: true
+    dest: /var/tmp/file_content.jsonl
+- name: Label several repositories in one invocation
+  pulp.squeezer.api_call:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    operations:
+      - operation_id: repositories_file_file_set_label
+        parameters:
+          file_file_repository_href: /pulp/api/v3/repositories/file/file/0189a8a4-7e6c-7b8e-9a5b-0cbd1f8e5e6d/
+        body:
+          key: team
+          value: storage
+      - operation_id: repositories_file_file_set_label
+        parameters:
+          file_file_repository_href: /pulp/api/v3/repositories/file/file/0189a8a4-8a2f-71c3-b1d4-3e5f6a7b8c9d/
+        body:
+          key: team
+          value: storage
+    concurrency: 8
 """
 
 RETURN = r"""
   response:
-    description: Pulp api response
+    description:
+      - Pulp api response
+      - With I(paginate), the C(count) of the first page and the combined C(results) (unless I(dest) is given).
     type: dict
     returned: always
+  written:
+    description: Number of results written to I(dest)
+    type: int
+    returned: when I(dest) is given
+  truncated:
+    description: Whether I(max_results) cut the results short
+    type: bool
+    returned: when I(paginate) is set
+  responses:
+    description:
+      - One entry per item of I(operations), in the same order.
+      - Each entry holds either the C(response) or the C(error) of the operation.
+    type: list
+    returned: when I(operations) is given
 """
 
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpAnsibleModule
+import json
+import os
+import tempfile
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+    check_concurrency,
+    pulp_context,
+)
+
+try:
+    from pulp_glue.common.context import PulpException, PulpNoWait
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+
+PAGE_SIZE = 100
+
+
+def iterate_pages(pulp_ctx, operation_id, parameters, max_results):
+    """
+    Yield the pages of a list operation, following them by offset until max_results are reached.
+    """
+    parameters = dict(parameters or {})
+    page_size = parameters.pop("limit", None) or PAGE_SIZE
+    offset = parameters.pop("offset", None) or 0
+    remaining = max_results
+    while remaining is None or remaining > 0:
+        limit = page_size if remaining is None else min(page_size, remaining)
+        page = pulp_ctx.call(operation_id, parameters=dict(parameters, limit=limit, offset=offset))
+        yield page
+        if remaining is not None:
+            remaining -= len(page["results"])
+        if page["next"] is None or not page["results"]:
+            break
+        offset += len(page["results"])
+
+
+def call_paginated(module, operation_id, parameters):
+    if "limit" not in module.pulp_ctx.api.param_spec(operation_id, "query"):
+        raise SqueezerException(f"Operation '{operation_id}' cannot be paginated.")
+    max_results = module.params["max_results"]
+    if max_results is not None and max_results < 1:
+        raise SqueezerException("'max_results' must be at least 1.")
+    dest = module.params["dest"]
+    count = None
+    results = []
+    seen = 0
+    if dest is None:
+        for page in iterate_pages(module.pulp_ctx, operation_id, parameters, max_results):
+            if count is None:
+                count = page["count"]
+            results.extend(page["results"])
+        seen = len(results)
+        module.set_result("response", {"count": count, "results": results})
+    else:
+        fd, tmp_dest = tempfile.mkstemp(dir=module.tmpdir)
+        with os.fdopen(fd, "w") as dest_file:
+            for page in iterate_pages(module.pulp_ctx, operation_id, parameters, max_results):
+                if count is None:
+                    count = page["count"]
+                for entity in page["results"]:
+                    dest_file.write(json.dumps(entity, sort_keys=True) + "\n")
+                seen += len(page["results"])
+        if not os.path.exists(dest) or module.sha256(dest) != module.sha256(tmp_dest):
+            if not module.check_mode:
+                module.atomic_move(tmp_dest, dest)
+            module.set_changed()
+        module.set_result("response", {"count": count})
+        module.set_result("written", seen)
+    offset = (parameters or {}).get("offset") or 0
+    module.set_result("truncated", seen < count - offset)
+
+
+def call_many(module, operations):
+    pulp_ctx = module.pulp_ctx
+    safe_methods = ["GET", "HEAD"]
+    for operation in operations:
+        if operation["operation_id"] not in pulp_ctx.api.operations:
+            raise SqueezerException(f"Unknown operation '{operation['operation_id']}'.")
+        if pulp_ctx.api.operations[operation["operation_id"]][0].upper() not in safe_methods:
+            module.set_changed()
+
+    # The glue context and its session are not safe to share between threads.
+    worker = threading.local()
+
+    def call(operation):
+        if module.check_mode and (
+            pulp_ctx.api.operations[operation["operation_id"]][0].upper() not in safe_methods
+        ):
+            return {"response": None}
+        try:
+            if not hasattr(worker, "pulp_ctx"):
+                worker.pulp_ctx = pulp_context(
+                    module.params, check_mode=module.check_mode, session_auth=pulp_ctx.session_auth
+                )
+            return {
+                "response": worker.pulp_ctx.call(
+                    operation["operation_id"],
+                    non_blocking=not module.params["wait"],
+                    parameters=operation["parameters"],
+                    body=operation["body"],
+                )
+            }
+        except (PulpException, PulpNoWait, SqueezerException) as e:
+            return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=module.params["concurrency"]) as executor:
+        responses = list(executor.map(call, operations))
+    module.set_result("responses", responses)
+    errors = sum(1 for response in responses if "error" in response)
+    if errors:
+        raise SqueezerException(f"{errors} of {len(operations)} operations failed.")
 
 
 def main():
     with PulpAnsibleModule(
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
-            operation_id=dict(required=True),
+            operation_id=dict(),
             parameters=dict(type="dict"),
             body=dict(type="dict"),
-        )
+            paginate=dict(type="bool", default=False),
+            max_results=dict(type="int"),
+            dest=dict(type="path"),
+            operations=dict(
+                type="list",
+                elements="dict",
+                options=dict(
+                    operation_id=dict(required=True),
+                    parameters=dict(type="dict"),
+                    body=dict(type="dict"),
+                ),
+            ),
+            concurrency=dict(type="int", default=4),
+            wait=dict(type="bool", default=True),
+        ),
+        required_one_of=[("operation_id", "operations")],
+        mutually_exclusive=[
+            ("operation_id", "operations"),
+            ("parameters", "operations"),
+            ("body", "operations"),
+        ],
     ) as module:
+        if module.params["operations"] is not None:
+            if module.params["paginate"]:
+                raise SqueezerException("'operations' cannot be paginated.")
+            check_concurrency(module.params["concurrency"])
+            call_many(module, module.params["operations"])
+            return
         operation_id = module.params["operation_id"]
         parameters = module.params["parameters"]
         body = module.params["body"]
+        if not module.params["paginate"]:
+            for key in ["max_results", "dest"]:
+                if module.params[key] is not None:
+                    raise SqueezerException(f"'{key}' requires 'paginate'.")
         if module.pulp_ctx.api.operations[operation_id][0].upper() not in ["GET", "HEAD"]:
+            if module.params["paginate"]:
+                raise SqueezerException("Only list operations can be paginated.")
             module.set_changed()
             if module.check_mode:
                 module.set_result("response", None)
                 return
-        response = module.pulp_ctx.call(operation_id, parameters=parameters, body=body)
-        module.set_result("response", response)
+        if module.params["paginate"]:
+            call_paginated(module, operation_id, parameters)
+        else:
+            response = module.pulp_ctx.call(operation_id, parameters=parameters, body=body)
+            module.set_result("response", response)
 
 
 if __name__ == "__main__":
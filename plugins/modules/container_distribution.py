@@ -15,6 +15,7 @@ module: container_distribution
 short_description: Manage container distributions of a pulp api server instance
 description:
   - "This performs CRUD operations on container distributions in a pulp api server instance."
+  - "With I(pulp_label_select), all matching distributions are listed, updated or deleted at once. No distributions are created."
 options:
   name:
     description:
@@ -50,6 +51,8 @@ options:
     required: false
 extends_documentation_fragment:
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.label_select
+  - pulp.squeezer.pulp.snapshot
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -90,7 +93,12 @@ RETURN = r"""
   distributions:
     description: List of container distributions
     type: list
-    returned: when no name is given
+    returned: when no name is given, or with pulp_label_select
+  distribuions:
+    description:
+      - Deprecated misspelling of C(distributions), with the same value.
+    type: list
+    returned: when no name is given, or with pulp_label_select
   distribution:
     description: Container distribution details
     type: dict
@@ -119,7 +127,8 @@ def main():
     with PulpEntityAnsibleModule(
         context_class=PulpContainerDistributionContext,
         entity_singular="distribution",
-        entity_plural="distribuions",
+        entity_plural="distributions",
+        deprecated_plural="distribuions",
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             name=dict(),
@@ -127,12 +136,16 @@ def main():
             repository=dict(),
             version=dict(type="int"),
             content_guard=dict(),
+            pulp_label_select=dict(),
+            concurrency=dict(type="int", default=4),
             private=dict(type="bool"),
         ),
         required_if=[
-            ("state", "present", ["name", "base_path"]),
-            ("state", "absent", ["name"]),
+            ("state", "present", ["name", "pulp_label_select"], True),
+            ("state", "present", ["base_path", "pulp_label_select"], True),
+            ("state", "absent", ["name", "pulp_label_select"], True),
         ],
+        mutually_exclusive=[("name", "pulp_label_select"), ("base_path", "pulp_label_select")],
     ) as module:
         repository_name = module.params["repository"]
         version = module.params["version"]
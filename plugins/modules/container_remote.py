@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
   - pulp.squeezer.pulp.remote
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.snapshot
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
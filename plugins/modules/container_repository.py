@@ -26,6 +26,7 @@ options:
     type: str
 extends_documentation_fragment:
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.snapshot
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -15,12 +15,34 @@ module: delete_orphans
 short_description: Deletes all orphaned entities of a pulp server
 description:
   - "This module deletes all orphaned artifacts and content units of a pulp server."
+  - "With I(content_hrefs), only the listed content units and their artifacts are deleted if they are orphans."
 options:
   protection_time:
     description: |
       How long in minutes Pulp should hold orphan Content and Artifacts before becoming candidates
       for cleanup task
     type: int
+  content_hrefs:
+    description:
+      - Restrict the cleanup to these content units.
+      - An empty list deletes nothing.
+    type: list
+    elements: str
+    version_added: "0.0.16"
+  batch_size:
+    description:
+      - Number of content units to clean up per task with I(content_hrefs).
+    type: int
+    default: 500
+    version_added: "0.0.16"
+  threshold:
+    description:
+      - Count the orphaned content units and artifacts first and only clean up if more than this many of either are found.
+      - Orphans are counted with the C(orphaned_for) filter of the list endpoints.
+        If the server does not offer it, the count is reported as null and the cleanup always runs.
+      - Mutually exclusive with I(content_hrefs).
+    type: int
+    version_added: "0.0.16"
 extends_documentation_fragment:
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
@@ -34,6 +56,29 @@ EXAMPLES = r"""
     pulp_url: https://pulp.example.org
     username: admin
     password: password
+- name: Remove content from a repository
+  pulp.squeezer.file_repository_content:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    repository: my_file_repo
+    absent_content:
+      - relative_path: file/to/be/absent
+        sha256: 0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef
+  register: content_result
+- name: Delete only the content that was just removed
+  pulp.squeezer.delete_orphans:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    protection_time: 0
+    content_hrefs: "{{ content_result.content_removed }}"
+- name: Delete orphans only if there are more than 1000 of them
+  pulp.squeezer.delete_orphans:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    threshold: 1000
 """
 
 RETURN = r"""
@@ -41,12 +86,19 @@ RETURN = r"""
     description: Summary of deleted entities
     type: dict
     returned: always
+  orphans:
+    description: Number of orphaned content units and artifacts found before the cleanup
+    type: dict
+    returned: when I(threshold) is set
 """
 
 
 import traceback
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpAnsibleModule
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+)
 
 try:
     from pulp_glue.core.context import PulpOrphanContext
@@ -57,30 +109,77 @@ except ImportError:
     PulpTaskContext = None
 
 
+def count_orphans(module, operation_id, protection_time):
+    """
+    Count the orphans listed by an operation, or return None if it cannot filter for them.
+
+    An `orphaned_for` of -1 makes the server apply its own ORPHAN_PROTECTION_TIME.
+    """
+    if "orphaned_for" not in module.pulp_ctx.api.param_spec(operation_id, "query"):
+        return None
+    return module.pulp_ctx.call(
+        operation_id,
+        parameters={
+            "orphaned_for": float(-1 if protection_time is None else protection_time),
+            "limit": 1,
+            "fields": ["pulp_href"],
+        },
+    )["count"]
+
+
 def main():
     with PulpAnsibleModule(
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             protection_time=dict(type="int"),
+            content_hrefs=dict(type="list", elements="str"),
+            batch_size=dict(type="int", default=500),
+            threshold=dict(type="int"),
         ),
+        mutually_exclusive=[("content_hrefs", "threshold")],
     ) as module:
-        if not module.check_mode:
-            body = {}
-            protection_time = module.params.get("protection_time")
-            if protection_time is not None:
-                body["orphan_protection_time"] = protection_time
-            task = PulpOrphanContext(module.pulp_ctx).cleanup(body=body)
-            summary = {
-                item["message"].split(" ")[-1].lower(): item["total"]
-                for item in task["progress_reports"]
-            }
+        body = {}
+        protection_time = module.params.get("protection_time")
+        if protection_time is not None:
+            body["orphan_protection_time"] = protection_time
+        content_hrefs = module.params["content_hrefs"]
+        if content_hrefs is None:
+            batches = [body]
         else:
-            # Fake it
-            summary = {
-                "artifacts": 0,
-                "content": 0,
+            if module.params["batch_size"] < 1:
+                raise SqueezerException("'batch_size' must be at least 1.")
+            content_hrefs = list(dict.fromkeys(content_hrefs))
+            batch_size = module.params["batch_size"]
+            batches = [
+                dict(body, content_hrefs=content_hrefs[i : i + batch_size])
+                for i in range(0, len(content_hrefs), batch_size)
+            ]
+
+        threshold = module.params["threshold"]
+        if threshold is not None:
+            orphans = {
+                "artifacts": count_orphans(module, "artifacts_list", protection_time),
+                "content": count_orphans(module, "content_list", protection_time),
             }
-        module.set_changed()
+            module.set_result("orphans", orphans)
+            if None in orphans.values():
+                module.warn("The server cannot count orphans, cleaning up regardless of threshold.")
+            elif max(orphans.values()) <= threshold:
+                batches = []
+
+        summary = {
+            "artifacts": 0,
+            "content": 0,
+        }
+        if not module.check_mode:
+            orphan_ctx = PulpOrphanContext(module.pulp_ctx)
+            for batch in batches:
+                task = orphan_ctx.cleanup(body=batch)
+                for item in task["progress_reports"]:
+                    key = item["message"].split(" ")[-1].lower()
+                    summary[key] = summary.get(key, 0) + item["total"]
+        if batches:
+            module.set_changed()
         module.set_result("summary", summary)
 
 
@@ -0,0 +1,589 @@
+#!/usr/bin/python
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: desired_state
+short_description: Bring many remotes, repositories, publications and distributions into a desired state at once
+description:
+  - "This takes the desired state of the content guards, remotes, repositories, publications and distributions of a plugin as one document, and creates or updates all entities that differ from it."
+  - "All named entities are looked up with a few list requests. Changes that do not depend on each other are made concurrently, while an entity is only changed after the entities it refers to, e.g. a distribution after the publication it serves."
+  - "In check mode, the module reports the plan of changes without making them."
+  - "Entities not mentioned in the document are left alone. Nothing is deleted."
+version_added: "0.0.16"
+options:
+  plugin:
+    description:
+      - Plugin of the remotes, repositories, publications and distributions.
+    type: str
+    required: true
+    choices:
+      - file
+      - python
+      - rpm
+  content_guards:
+    description:
+      - Content guards to protect distributions with.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+          - Name of the content guard.
+        type: str
+        required: true
+      type:
+        description:
+          - Type of the content guard.
+        type: str
+        required: true
+        choices:
+          - content_redirect
+          - rbac
+          - rhsm
+          - x509
+      attributes:
+        description:
+          - Attributes of the content guard as accepted by the api, e.g. C(ca_certificate) for x509 content guards.
+        type: dict
+  remotes:
+    description:
+      - Remotes to sync repositories from.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+          - Name of the remote.
+        type: str
+        required: true
+      attributes:
+        description:
+          - Attributes of the remote as accepted by the api, e.g. C(url) and C(policy).
+          - Secrets like C(password) are not returned by the api, so remotes with them are always updated.
+        type: dict
+  repositories:
+    description:
+      - Repositories.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+          - Name of the repository.
+        type: str
+        required: true
+      remote:
+        description:
+          - Name of the remote of the repository.
+        type: str
+      attributes:
+        description:
+          - Attributes of the repository as accepted by the api, e.g. C(description) or C(retain_repo_versions).
+        type: dict
+  publications:
+    description:
+      - Repositories whose latest version should be published.
+      - An existing publication of the latest version is reused if it matches the attributes.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      repository:
+        description:
+          - Name of the repository.
+        type: str
+        required: true
+      attributes:
+        description:
+          - Attributes of the publication as accepted by the api, e.g. C(manifest) for file publications.
+        type: dict
+  distributions:
+    description:
+      - Distributions.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+          - Name of the distribution.
+        type: str
+        required: true
+      base_path:
+        description:
+          - Base path of the distribution.
+        type: str
+        required: true
+      publication:
+        description:
+          - Name of a repository listed in I(publications), whose publication the distribution should serve.
+          - Mutually exclusive with I(repository).
+        type: str
+      repository:
+        description:
+          - Name of a repository whose latest version the distribution should serve.
+          - Mutually exclusive with I(publication).
+        type: str
+      content_guard:
+        description:
+          - Name of the content guard protecting the distribution.
+        type: str
+      attributes:
+        description:
+          - Further attributes of the distribution as accepted by the api.
+        type: dict
+  concurrency:
+    description:
+      - Number of changes to make at the same time.
+    type: int
+    default: 4
+extends_documentation_fragment:
+  - pulp.squeezer.pulp.glue
+  - pulp.squeezer.pulp
+author:
+  - Pulp Squeezer contributors (@pulp)
+"""
+
+EXAMPLES = r"""
+- name: Mirror some upstream file repositories
+  pulp.squeezer.desired_state:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    plugin: file
+    remotes:
+      - name: upstream_isos
+        attributes:
+          url: https://upstream.example.org/isos/PULP_MANIFEST
+          policy: on_demand
+    repositories:
+      - name: isos
+        remote: upstream_isos
+        attributes:
+          retain_repo_versions: 2
+    publications:
+      - repository: isos
+    distributions:
+      - name: isos
+        base_path: mirror/isos
+        publication: isos
+
+- name: Show what would change
+  pulp.squeezer.desired_state:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    plugin: file
+    distributions: "{{ all_file_distributions }}"
+  check_mode: true
+  register: plan
+"""
+
+RETURN = r"""
+  plan:
+    description:
+      - One entry per entity, ordered by kind and name.
+      - Each has the C(kind) and C(name) of the entity, the C(action) taken, which is C(create), C(update) or C(none), and the names of the C(changes) attributes.
+      - Unless in check mode, each has the C(pulp_href) of the entity, or an C(error) if changing it failed or was skipped because an entity it refers to failed.
+    type: list
+    returned: always
+"""
+
+
+import traceback
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.canonical import ENTITY_CANONICALIZERS
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+    check_concurrency,
+    dispatched_task,
+    entity_type,
+    failed_for,
+    find_publication,
+    lookup_by_name,
+    registered_context_class,
+    run_tasks,
+)
+
+try:
+    from pulp_glue.common.context import (
+        PulpContentGuardContext,
+        PulpDistributionContext,
+        PulpException,
+        PulpPublicationContext,
+        PulpRemoteContext,
+        PulpRepositoryContext,
+    )
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+
+
+# Entity kinds in the order in which they can refer to each other.
+KINDS = ["content_guard", "remote", "repository", "publication", "distribution"]
+CONTENT_GUARD_TYPES = {
+    "content_redirect": ("core", "content_redirect"),
+    "rbac": ("core", "rbac"),
+    "rhsm": ("certguard", "rhsm"),
+    "x509": ("certguard", "x509"),
+}
+# Stands in for the href of an entity that is yet to be created.
+PENDING = object()
+
+
+class Node:
+    """
+    An entity of the desired state.
+
+    References map attribute names to the (kind, name) of the entity whose href they hold.
+    """
+
+    def __init__(self, kind, name, attributes, references, context_class):
+        self.kind = kind
+        self.name = name
+        self.attributes = attributes or {}
+        self.references = references
+        self.context_class = context_class
+
+    @property
+    def key(self):
+        return (self.kind, self.name)
+
+
+class StateApplier:
+    def __init__(self, module):
+        self.module = module
+        self.pulp_ctx = module.pulp_ctx
+        plugin = module.params["plugin"]
+        self.context_classes = {
+            "remote": registered_context_class(PulpRemoteContext, plugin, plugin),
+            "repository": registered_context_class(PulpRepositoryContext, plugin, plugin),
+            "publication": registered_context_class(PulpPublicationContext, plugin, plugin),
+            "distribution": registered_context_class(PulpDistributionContext, plugin, plugin),
+        }
+        # Server side entities by kind and name, kept up to date while applying changes.
+        self.entities = {kind: {} for kind in KINDS}
+        self.nodes = {}
+        self.plan = {}
+
+    def add(self, kind, name, attributes, context_class=None, **references):
+        node = Node(
+            kind,
+            name,
+            attributes,
+            {key: value for key, value in references.items() if value[1] is not None},
+            context_class or self.context_classes[kind],
+        )
+        if node.key in self.nodes:
+            raise SqueezerException(f"The {kind} '{name}' is given more than once.")
+        self.nodes[node.key] = node
+
+    def build(self, params):
+        for item in params["content_guards"]:
+            self.add(
+                "content_guard",
+                item["name"],
+                item["attributes"],
+                context_class=registered_context_class(
+                    PulpContentGuardContext, *CONTENT_GUARD_TYPES[item["type"]]
+                ),
+            )
+        for item in params["remotes"]:
+            self.add("remote", item["name"], item["attributes"])
+        for item in params["repositories"]:
+            self.add(
+                "repository", item["name"], item["attributes"], remote=("remote", item["remote"])
+            )
+        for item in params["publications"]:
+            self.add(
+                "publication",
+                item["repository"],
+                item["attributes"],
+                repository_version=("repository", item["repository"]),
+            )
+        for item in params["distributions"]:
+            if item["publication"] is not None and item["repository"] is not None:
+                raise SqueezerException(
+                    f"The distribution '{item['name']}' can only serve a publication or a"
+                    " repository."
+                )
+            if item["publication"] is not None and ("publication", item["publication"]) not in (
+                self.nodes
+            ):
+                raise SqueezerException(
+                    f"The distribution '{item['name']}' serves the publication of"
+                    f" '{item['publication']}', which is not listed in publications."
+                )
+            attributes = dict(item["attributes"] or {}, base_path=item["base_path"])
+            # A distribution serves either a repository or a publication.
+            if item["publication"] is not None:
+                attributes["repository"] = ""
+            if item["repository"] is not None:
+                attributes["publication"] = ""
+            self.add(
+                "distribution",
+                item["name"],
+                attributes,
+                publication=("publication", item["publication"]),
+                repository=("repository", item["repository"]),
+                content_guard=("content_guard", item["content_guard"]),
+            )
+
+    def lookup(self):
+        """
+        Find all named entities, including those only referred to, with a few list requests.
+        """
+        names = {kind: set() for kind in KINDS}
+        for node in self.nodes.values():
+            names[node.kind].add(node.name)
+            for kind, name in node.references.values():
+                names[kind].add(name)
+        for kind in ["remote", "repository", "distribution"]:
+            if names[kind]:
+                self.entities[kind] = lookup_by_name(
+                    self.context_classes[kind](self.pulp_ctx), names[kind]
+                )
+        if names["content_guard"]:
+            self.entities["content_guard"] = lookup_by_name(
+                PulpContentGuardContext(self.pulp_ctx), names["content_guard"]
+            )
+        for kind in ["content_guard", "remote", "repository"]:
+            missing = sorted(
+                name
+                for name in names[kind]
+                if name not in self.entities[kind] and (kind, name) not in self.nodes
+            )
+            if missing:
+                raise SqueezerException(f"Could not find {kind} entities: {', '.join(missing)}.")
+
+    def find_publication(self, node):
+        """
+        Find a publication of the latest version of the repository that matches the attributes.
+        """
+        repository = self.entities["repository"].get(node.name)
+        if repository is None:
+            return None
+        return find_publication(
+            node.context_class(self.pulp_ctx), repository["latest_version_href"], node.attributes
+        )
+
+    def desired(self, node):
+        attributes = dict(node.attributes)
+        for key, (kind, name) in node.references.items():
+            entity = self.entities[kind].get(name)
+            if entity is None:
+                attributes[key] = PENDING
+            elif kind == "repository" and node.kind == "publication":
+                attributes[key] = entity["latest_version_href"]
+            else:
+                attributes[key] = entity["pulp_href"]
+        return attributes
+
+    def diff(self, node):
+        """
+        Return the action and the names of the attributes to change to reach the desired state.
+        """
+        desired = self.desired(node)
+        entity = self.entities[node.kind].get(node.name)
+        if entity is None:
+            return "create", sorted(desired)
+        if node.kind == "publication":
+            # Publications cannot be changed. A matching one exists.
+            return "none", []
+        canonicalizers = ENTITY_CANONICALIZERS.get(entity_type(node.context_class), {})
+
+        def canonical(key, value):
+            # The api represents unset references as null, but takes an empty string to unset them.
+            if value is None or value == "":
+                return None
+            if key in canonicalizers and value is not PENDING:
+                return canonicalizers[key](value)
+            return value
+
+        changes = sorted(
+            key
+            for key, value in desired.items()
+            if canonical(key, entity.get(key)) != canonical(key, value)
+        )
+        return ("update" if changes else "none"), changes
+
+    def make_plan(self):
+        for node in self.nodes.values():
+            if node.kind == "publication":
+                publication = self.find_publication(node)
+                if publication is not None:
+                    self.entities["publication"][node.name] = publication
+        for key in sorted(self.nodes, key=lambda key: (KINDS.index(key[0]), key[1])):
+            node = self.nodes[key]
+            action, changes = self.diff(node)
+            self.plan[key] = {
+                "kind": node.kind,
+                "name": node.name,
+                "action": action,
+                "changes": changes,
+            }
+
+    def dispatch(self, node):
+        """
+        Create or update the entity. Return its task, or None if the change is done already.
+        """
+        # Compare again, now that the entities this refers to are in their final state.
+        action, changes = self.diff(node)
+        self.plan[node.key].update(action=action, changes=changes)
+        entity = self.entities[node.kind].get(node.name)
+        context = node.context_class(self.pulp_ctx)
+        if action == "create":
+            body = {key: value for key, value in self.desired(node).items() if value != ""}
+            if node.kind != "publication":
+                body["name"] = node.name
+            result = context.create(body=body, non_blocking=True)
+        elif action == "update":
+            desired = self.desired(node)
+            context.pulp_href = entity["pulp_href"]
+            result = context.update(body={key: desired[key] for key in changes}, non_blocking=True)
+        else:
+            return None
+        task = dispatched_task(result)
+        if task is None:
+            self.entities[node.kind][node.name] = result
+        return task
+
+    def apply(self):
+        """
+        Execute the plan one kind after the other, the changes of each kind concurrently.
+
+        Entities only refer to entities of the kinds before them, so those are done by then.
+        """
+        for kind in KINDS:
+            nodes = {}
+            for key, node in sorted(self.nodes.items()):
+                if node.kind != kind:
+                    continue
+                failed = [
+                    reference
+                    for reference in node.references.values()
+                    if "error" in self.plan.get(reference, {})
+                ]
+                if failed:
+                    failed_kind, failed_name = failed[0]
+                    self.plan[key][
+                        "error"
+                    ] = f"Skipped because the {failed_kind} '{failed_name}' failed."
+                else:
+                    nodes[node.name] = node
+            finished, errors = run_tasks(
+                self.pulp_ctx, nodes, self.dispatch, self.module.params["concurrency"]
+            )
+            for name, error in errors.items():
+                self.plan[(kind, name)]["error"] = error
+            for name, task in finished.items():
+                node = nodes[name]
+                if task is not None:
+                    # Fetch the entity the task created or changed.
+                    context = node.context_class(self.pulp_ctx)
+                    context.pulp_href = (
+                        task["created_resources"][0]
+                        if task["created_resources"]
+                        else self.entities[kind][name]["pulp_href"]
+                    )
+                    try:
+                        self.entities[kind][name] = context.entity
+                    except PulpException as e:
+                        self.plan[node.key]["error"] = str(e)
+                        continue
+                self.plan[node.key]["pulp_href"] = self.entities[kind][name]["pulp_href"]
+
+
+def main():
+    with PulpAnsibleModule(
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
+        argument_spec=dict(
+            plugin=dict(required=True, choices=["file", "python", "rpm"]),
+            content_guards=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(required=True),
+                    type=dict(required=True, choices=sorted(CONTENT_GUARD_TYPES)),
+                    attributes=dict(type="dict"),
+                ),
+            ),
+            remotes=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(required=True),
+                    attributes=dict(type="dict"),
+                ),
+            ),
+            repositories=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(required=True),
+                    remote=dict(),
+                    attributes=dict(type="dict"),
+                ),
+            ),
+            publications=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    repository=dict(required=True),
+                    attributes=dict(type="dict"),
+                ),
+            ),
+            distributions=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(required=True),
+                    base_path=dict(required=True),
+                    publication=dict(),
+                    repository=dict(),
+                    content_guard=dict(),
+                    attributes=dict(type="dict"),
+                ),
+            ),
+            concurrency=dict(type="int", default=4),
+        ),
+    ) as module:
+        check_concurrency(module.params["concurrency"])
+        applier = StateApplier(module)
+        applier.build(module.params)
+        applier.lookup()
+        applier.make_plan()
+        if not module.check_mode:
+            applier.apply()
+        plan = list(applier.plan.values())
+        module.set_result("plan", plan)
+        if any(item["action"] != "none" for item in plan):
+            module.set_changed()
+        errors = {
+            f"{item['kind']} {item['name']}": item["error"] for item in plan if "error" in item
+        }
+        if errors:
+            raise failed_for("Applying the desired state", errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/python
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: file_directory_sync
+short_description: Sync a local directory into a file repository of a pulp server
+description:
+  - "This module makes the latest version of a file repository contain the files of a local directory, e.g. a build output."
+  - "The files are hashed concurrently and compared with the content of the latest repository version, which is listed in pages. Only artifacts missing on the server are uploaded."
+  - "All additions and removals are committed as a single new repository version."
+version_added: "0.0.16"
+options:
+  repository:
+    description:
+      - Name of the repository to sync into.
+    type: str
+    required: true
+  path:
+    description:
+      - Local directory to sync, on the host the module runs on.
+      - Its subdirectories are included. Symbolic links are followed.
+    type: path
+    required: true
+  prefix:
+    description:
+      - Directory in the repository to place the files in.
+      - Defaults to the top of the repository.
+    type: str
+    required: false
+  mirror:
+    description:
+      - Also remove content from the repository whose file is not in the directory.
+      - With O(prefix), only content below the prefix is removed.
+    type: bool
+    default: false
+  concurrency:
+    description:
+      - Number of files to hash, upload or create content for at the same time.
+    type: int
+    default: 4
+  chunk_size:
+    description:
+      - Files larger than this are uploaded in chunks of this size.
+    type: int
+    default: 33554432
+notes:
+  - Content whose relative path has a file with a different digest in the directory is always replaced.
+  - Symlinks are followed, except those to a directory they are inside of, which would loop forever.
+  - Anything in the directory that is neither a file nor a directory, like a broken symlink, fails the module.
+extends_documentation_fragment:
+  - pulp.squeezer.pulp.glue
+  - pulp.squeezer.pulp
+author:
+  - Pulp Squeezer contributors (@pulp)
+"""
+
+EXAMPLES = r"""
+- name: Publish a build output into a file repository
+  pulp.squeezer.file_directory_sync:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    repository: my_file_repo
+    path: /srv/build/output
+    prefix: nightly
+    mirror: true
+    concurrency: 8
+  register: directory_sync_result
+- name: Report uploaded files
+  debug:
+    var: directory_sync_result.uploaded
+"""
+
+RETURN = r"""
+  repository_version:
+    description: Href of the repository version found or created
+    type: str
+    returned: always
+  content_added:
+    description:
+      - List of content unit hrefs that were added.
+      - In check mode, content units that would be created are not included.
+    type: list
+    returned: always
+  content_removed:
+    description: List of content unit hrefs that were removed
+    type: list
+    returned: always
+  uploaded:
+    description: Relative paths of the files whose artifacts were uploaded
+    type: list
+    returned: always
+"""
+
+
+import os
+import posixpath
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+    check_concurrency,
+    failed_for,
+    list_entities,
+    run_tasks,
+)
+
+try:
+    from pulp_glue.core.context import PulpArtifactContext, PulpUploadContext
+    from pulp_glue.file.context import PulpFileContentContext, PulpFileRepositoryContext
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+
+
+def scan_directory(path, prefix):
+    """
+    Find all files below a directory. Return their local paths by relative path in the repository.
+
+    Symlinks are followed, except to a directory the walk is already inside of.
+    Anything else than files and directories, like broken symlinks, is an error.
+    """
+    files = {}
+    stat = os.stat(path)
+    ancestors = {path: {(stat.st_dev, stat.st_ino)}}
+    for root, dirnames, filenames in os.walk(path, followlinks=True):
+        parents = ancestors.pop(root)
+        followed = []
+        for dirname in sorted(dirnames):
+            stat = os.stat(os.path.join(root, dirname))
+            if (stat.st_dev, stat.st_ino) not in parents:
+                followed.append(dirname)
+                ancestors[os.path.join(root, dirname)] = parents | {(stat.st_dev, stat.st_ino)}
+        dirnames[:] = followed
+        for filename in sorted(filenames):
+            local_path = os.path.join(root, filename)
+            if not os.path.isfile(local_path):
+                raise SqueezerException(
+                    f"'{local_path}' is neither a file nor a directory, e.g. a broken symbolic link."
+                )
+            relative_path = os.path.relpath(local_path, path).replace(os.sep, "/")
+            if prefix:
+                relative_path = posixpath.join(prefix, relative_path)
+            files[relative_path] = local_path
+    return files
+
+
+class DirectorySyncer:
+    def __init__(self, module):
+        self.module = module
+        self.pulp_ctx = module.pulp_ctx
+        self.concurrency = module.params["concurrency"]
+        self.chunk_size = module.params["chunk_size"]
+        self.prefix = (module.params["prefix"] or "").strip("/")
+        self.repository_ctx = PulpFileRepositoryContext(
+            self.pulp_ctx, entity={"name": module.params["repository"]}
+        )
+
+    def hash_files(self, files):
+        """
+        Hash the files concurrently. Return the sha256 digests by relative path.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            digests = executor.map(self.module.sha256, files.values())
+            return dict(zip(files, digests))
+
+    def version_content(self, repository_version_href):
+        """
+        Find all content of a repository version. Return it by relative path.
+        """
+        return {
+            content["relative_path"]: content
+            for content in list_entities(
+                PulpFileContentContext(self.pulp_ctx),
+                {
+                    "repository_version": repository_version_href,
+                    "fields": ["pulp_href", "relative_path", "sha256", "artifact"],
+                },
+            )
+        }
+
+    def find_artifact(self, sha256):
+        artifacts = PulpArtifactContext(self.pulp_ctx).call(
+            "list", parameters={"sha256": sha256, "limit": 1, "fields": ["pulp_href"]}
+        )["results"]
+        return artifacts[0]["pulp_href"] if artifacts else None
+
+    def find_contents(self, sha256):
+        """
+        Find all content units with the digest. Return their hrefs by relative path.
+        """
+        return {
+            content["relative_path"]: content["pulp_href"]
+            for content in list_entities(
+                PulpFileContentContext(self.pulp_ctx),
+                {"sha256": sha256, "fields": ["pulp_href", "relative_path"]},
+            )
+        }
+
+    def upload_artifact(self, local_path, sha256):
+        """
+        Upload a file whose digest is known already. Return the href of the new artifact.
+        """
+        with open(local_path, "rb") as infile:
+            if os.path.getsize(local_path) < self.chunk_size:
+                return PulpArtifactContext(self.pulp_ctx).create(
+                    body={"sha256": sha256, "file": infile}
+                )["pulp_href"]
+            upload_ctx = PulpUploadContext(self.pulp_ctx)
+            upload_ctx.upload_file(infile, self.chunk_size)
+            try:
+                task = upload_ctx.commit(sha256)
+            except Exception:
+                upload_ctx.delete()
+                raise
+            return task["created_resources"][0]
+
+    def prepare_digest(self, items, artifact_href):
+        """
+        Find or upload the artifact shared by files with the same digest, unless its href is known
+        already, and find their content units. Return whether the artifact was uploaded, its href,
+        and the hrefs of the content units by relative path.
+        """
+        sha256 = items[0]["sha256"]
+        if artifact_href is None:
+            artifact_href = self.find_artifact(sha256)
+        if artifact_href is None:
+            if self.module.check_mode:
+                return True, None, {}
+            return True, self.upload_artifact(items[0]["local_path"], sha256), {}
+        # Content units cannot exist without their artifact.
+        return False, artifact_href, self.find_contents(sha256)
+
+    def create_content(self, items):
+        """
+        Create the content units for the items concurrently. Return their hrefs by relative path.
+        """
+        content_ctx = PulpFileContentContext(self.pulp_ctx)
+        finished, errors = run_tasks(
+            self.pulp_ctx,
+            {item["relative_path"]: item for item in items},
+            lambda item: content_ctx.create(
+                body={"relative_path": item["relative_path"], "artifact": item["artifact"]},
+                non_blocking=True,
+            ),
+            self.concurrency,
+        )
+        if errors:
+            raise failed_for("Creating content", errors)
+        return {name: task["created_resources"][0] for name, task in finished.items()}
+
+    def sync(self, files):
+        repository_version_href = self.repository_ctx.entity["latest_version_href"]
+        digests = self.hash_files(files)
+        existing = self.version_content(repository_version_href)
+
+        missing = []
+        content_to_remove = []
+        for relative_path, sha256 in digests.items():
+            content = existing.get(relative_path)
+            if content is not None and content["sha256"] == sha256:
+                continue
+            if content is not None:
+                content_to_remove.append(content["pulp_href"])
+            missing.append(
+                {
+                    "relative_path": relative_path,
+                    "sha256": sha256,
+                    "local_path": files[relative_path],
+                }
+            )
+        if self.module.params["mirror"]:
+            below = self.prefix + "/" if self.prefix else ""
+            content_to_remove.extend(
+                content["pulp_href"]
+                for relative_path, content in sorted(existing.items())
+                if relative_path.startswith(below) and relative_path not in digests
+            )
+
+        # Files with the same digest share their artifact and are looked up together.
+        by_digest = {}
+        for item in missing:
+            by_digest.setdefault(item["sha256"], []).append(item)
+        # The artifacts of the content in the repository version need not be looked up.
+        known_artifacts = {
+            content["sha256"]: content["artifact"]
+            for content in existing.values()
+            if content.get("artifact")
+        }
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            prepared = executor.map(
+                self.prepare_digest,
+                by_digest.values(),
+                [known_artifacts.get(sha256) for sha256 in by_digest],
+            )
+            for items, (uploaded, artifact_href, contents) in zip(by_digest.values(), prepared):
+                for item in items:
+                    item["artifact"] = artifact_href
+                    item["uploaded"] = uploaded and item is items[0]
+                    item["content"] = contents.get(item["relative_path"])
+        content_to_add = [item["content"] for item in missing if item.get("content")]
+        uncreated = [item for item in missing if not item.get("content")]
+
+        if missing or content_to_remove:
+            self.module.set_changed()
+            if not self.module.check_mode:
+                if uncreated:
+                    content_to_add.extend(self.create_content(uncreated).values())
+                task = self.repository_ctx.modify(
+                    add_content=content_to_add,
+                    remove_content=content_to_remove,
+                    base_version=repository_version_href,
+                )
+                if task["created_resources"]:
+                    repository_version_href = task["created_resources"][0]
+
+        self.module.set_result("content_added", sorted(content_to_add))
+        self.module.set_result("content_removed", sorted(content_to_remove))
+        self.module.set_result(
+            "uploaded", [item["relative_path"] for item in missing if item["uploaded"]]
+        )
+        self.module.set_result("repository_version", repository_version_href)
+
+
+def main():
+    with PulpAnsibleModule(
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
+        argument_spec=dict(
+            repository=dict(required=True),
+            path=dict(type="path", required=True),
+            prefix=dict(),
+            mirror=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=4),
+            chunk_size=dict(type="int", default=33554432),
+        ),
+    ) as module:
+        check_concurrency(module.params["concurrency"])
+        if not os.path.isdir(module.params["path"]):
+            raise SqueezerException(f"Directory '{module.params['path']}' not found.")
+        syncer = DirectorySyncer(module)
+        syncer.sync(scan_directory(module.params["path"], syncer.prefix))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ module: file_publication
 short_description: Manage file publications of a pulp api server instance
 description:
   - "This performs CRUD operations on file publications in a pulp api server instance."
+  - "With I(pulp_label_select), the latest versions of all matching repositories are published, unless a publication of them exists already."
 options:
   repository:
     description:
@@ -33,6 +34,7 @@ options:
     required: false
 extends_documentation_fragment:
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.label_select
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -76,12 +78,20 @@ RETURN = r"""
     description: File publication details
     type: dict
     returned: when repository is given
+  repositories:
+    description: Publication href of the latest version by the name of each selected repository
+    type: dict
+    returned: when pulp_label_select is given
+    version_added: "0.0.16"
 """
 
 
 import traceback
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpEntityAnsibleModule
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpEntityAnsibleModule,
+    publish_selected,
+)
 
 try:
     from pulp_glue.file.context import PulpFilePublicationContext, PulpFileRepositoryContext
@@ -101,12 +111,15 @@ def main():
         argument_spec=dict(
             repository=dict(),
             version=dict(type="int"),
+            pulp_label_select=dict(),
+            concurrency=dict(type="int", default=4),
             manifest=dict(),
         ),
         required_if=(
-            ["state", "present", ["repository"]],
+            ["state", "present", ["repository", "pulp_label_select"], True],
             ["state", "absent", ["repository"]],
         ),
+        mutually_exclusive=[("repository", "pulp_label_select"), ("version", "pulp_label_select")],
     ) as module:
         repository_name = module.params["repository"]
         version = module.params["version"]
@@ -114,6 +127,10 @@ def main():
             key: module.params[key] for key in ["manifest"] if module.params[key] is not None
         }
 
+        if module.params["pulp_label_select"] is not None:
+            publish_selected(module, PulpFileRepositoryContext, desired_attributes)
+            return
+
         if repository_name:
             repository_ctx = PulpFileRepositoryContext(
                 module.pulp_ctx, entity={"name": repository_name}
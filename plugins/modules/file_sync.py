@@ -16,6 +16,7 @@ short_description: Synchronize a file remote on a pulp server
 description:
   - "This module synchronizes a file remote into a repository."
   - "In check_mode this module assumes, nothing changed upstream."
+  - "With I(pulp_label_select), all matching repositories are synchronized from the remotes configured on them, and I(remote) cannot be used."
 options:
   remote:
     description:
@@ -25,9 +26,11 @@ options:
   repository:
     description:
       - Name of the repository to synchronize into
+      - Exactly one of I(repository) and I(pulp_label_select) is required.
     type: str
-    required: true
+    required: false
 extends_documentation_fragment:
+  - pulp.squeezer.pulp.label_select
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -46,13 +49,25 @@ EXAMPLES = r"""
 - name: Report synched repository version
   debug:
     var: sync_result.repository_version
+- name: Sync all production repositories from their preconfigured remotes
+  pulp.squeezer.file_sync:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    pulp_label_select: env=production
+    concurrency: 8
 """
 
 RETURN = r"""
   repository_version:
     description: Repository version after synching
     type: dict
-    returned: always
+    returned: when repository is given
+  repositories:
+    description: Repository version after synching by the name of each selected repository
+    type: dict
+    returned: when pulp_label_select is given
+    version_added: "0.0.16"
 """
 
 
@@ -61,6 +76,7 @@ import traceback
 from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
     PulpAnsibleModule,
     SqueezerException,
+    sync_selected,
 )
 
 try:
@@ -76,9 +92,17 @@ def main():
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             remote=dict(required=False),
-            repository=dict(required=True),
+            repository=dict(),
+            pulp_label_select=dict(),
+            concurrency=dict(type="int", default=4),
         ),
+        required_one_of=[("repository", "pulp_label_select")],
+        mutually_exclusive=[("repository", "pulp_label_select"), ("remote", "pulp_label_select")],
     ) as module:
+        if module.params["pulp_label_select"] is not None:
+            sync_selected(module, PulpFileRepositoryContext)
+            return
+
         repository_ctx = PulpFileRepositoryContext(
             module.pulp_ctx, entity={"name": module.params["repository"]}
         )
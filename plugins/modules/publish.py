@@ -0,0 +1,309 @@
+#!/usr/bin/python
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: publish
+short_description: Publish repositories and point their distributions at the new publications
+description:
+  - "For each repository, this makes sure a publication of the latest repository version exists and that the repository's distribution serves it."
+  - "All repositories and distributions are looked up with a few list requests. Then the publication tasks of all repositories are dispatched concurrently, followed by the tasks pointing the distributions at the new publications."
+options:
+  plugin:
+    description:
+      - Plugin of the repositories, publications and distributions.
+    type: str
+    required: true
+    choices:
+      - file
+      - python
+      - rpm
+  repositories:
+    description:
+      - Repositories to publish.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      repository:
+        description:
+          - Name of the repository.
+        type: str
+        required: true
+      distribution:
+        description:
+          - Name of the distribution to serve the publication. Defaults to the name of the repository.
+        type: str
+        required: false
+      base_path:
+        description:
+          - Base path of the distribution, if it needs to be created.
+          - Without it, a missing distribution is an error.
+        type: str
+        required: false
+  publication_attributes:
+    description:
+      - Additional attributes for new publications, e.g. C(manifest) for file publications.
+      - Existing publications of the latest version are only reused if they match these.
+    type: dict
+    required: false
+  concurrency:
+    description:
+      - Number of tasks to keep in flight at the same time.
+    type: int
+    default: 4
+extends_documentation_fragment:
+  - pulp.squeezer.pulp.glue
+  - pulp.squeezer.pulp
+author:
+  - Pulp Squeezer contributors (@pulp)
+"""
+
+EXAMPLES = r"""
+- name: Publish and distribute the latest versions of some file repositories
+  pulp.squeezer.publish:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    plugin: file
+    repositories:
+      - repository: my_file_repo
+      - repository: my_other_file_repo
+        distribution: other_files
+        base_path: files/other
+  register: publish_result
+- name: Report how long each repository took
+  debug:
+    msg: "{{ item.repository }}: {{ item.timings.total }}s"
+  loop: "{{ publish_result.repositories }}"
+"""
+
+RETURN = r"""
+  repositories:
+    description:
+      - One entry per repository, in the given order.
+      - Each has the C(repository_version), C(publication) and C(distribution) hrefs, whether the publication was C(created) and the distribution C(updated), and the C(timings) of its publication and distribution tasks in seconds, from dispatching them until they finished.
+      - If processing a repository failed, its entry also has an C(error).
+    type: list
+    returned: always
+"""
+
+
+import traceback
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+    check_concurrency,
+    dispatched_task,
+    failed_for,
+    find_publication,
+    lookup_by_name,
+    parse_datetime,
+    registered_context_class,
+    run_tasks,
+)
+
+try:
+    from pulp_glue.common.context import (
+        PulpDistributionContext,
+        PulpPublicationContext,
+        PulpRepositoryContext,
+    )
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+
+
+class Publisher:
+    def __init__(self, module):
+        self.module = module
+        self.pulp_ctx = module.pulp_ctx
+        plugin = module.params["plugin"]
+        self.repository_class = registered_context_class(PulpRepositoryContext, plugin, plugin)
+        self.publication_class = registered_context_class(PulpPublicationContext, plugin, plugin)
+        self.distribution_class = registered_context_class(PulpDistributionContext, plugin, plugin)
+        self.publication_attributes = module.params["publication_attributes"] or {}
+
+    def lookup(self, items):
+        self.repositories = lookup_by_name(
+            self.repository_class(self.pulp_ctx), [item["repository"] for item in items]
+        )
+        self.distributions = lookup_by_name(
+            self.distribution_class(self.pulp_ctx), [item["distribution"] for item in items]
+        )
+        missing = sorted({item["repository"] for item in items} - set(self.repositories))
+        if missing:
+            raise SqueezerException(f"Could not find repositories: {', '.join(missing)}.")
+        missing = sorted(
+            item["distribution"]
+            for item in items
+            if item["distribution"] not in self.distributions and item["base_path"] is None
+        )
+        if missing:
+            raise SqueezerException(
+                f"Could not find distributions: {', '.join(missing)}. Specify a base_path to"
+                " create them."
+            )
+
+    def plan(self, item):
+        repository = self.repositories[item["repository"]]
+        distribution = self.distributions.get(item["distribution"])
+        publication = find_publication(
+            self.publication_class(self.pulp_ctx),
+            repository["latest_version_href"],
+            self.publication_attributes,
+        )
+        return {
+            "repository": item["repository"],
+            "repository_version": repository["latest_version_href"],
+            "publication": publication and publication["pulp_href"],
+            "distribution": distribution and distribution["pulp_href"],
+            "created": publication is None,
+            "updated": (
+                publication is None
+                or distribution is None
+                or distribution.get("publication") != publication["pulp_href"]
+                or bool(distribution.get("repository"))
+            ),
+            "timings": {"publish": 0, "distribute": 0, "total": 0},
+        }
+
+    def publish(self, results):
+        """
+        Create the missing publications, keeping `concurrency` of their tasks in flight.
+        """
+        unpublished = {
+            result["repository"]: result["repository_version"]
+            for result in results
+            if result["created"]
+        }
+        finished, errors = run_tasks(
+            self.pulp_ctx,
+            unpublished,
+            lambda repository_version: self.publication_class(self.pulp_ctx).create(
+                body={**self.publication_attributes, "repository_version": repository_version},
+                non_blocking=True,
+            ),
+            self.module.params["concurrency"],
+        )
+        for result in results:
+            if result["repository"] in errors:
+                result["error"] = errors[result["repository"]]
+            elif result["repository"] in finished:
+                task = finished[result["repository"]]
+                result["publication"] = task["created_resources"][0]
+                result["timings"]["publish"] = task_seconds(task)
+
+    def distribute(self, items, results):
+        """
+        Point the distributions at the publications, keeping `concurrency` of their tasks in
+        flight.
+        """
+        changes = {
+            item["distribution"]: (item, result)
+            for item, result in zip(items, results)
+            if result["updated"] and "error" not in result
+        }
+
+        def dispatch(change):
+            item, result = change
+            distribution_ctx = self.distribution_class(self.pulp_ctx)
+            distribution = self.distributions.get(item["distribution"])
+            if distribution is None:
+                created = distribution_ctx.create(
+                    body={
+                        "name": item["distribution"],
+                        "base_path": item["base_path"],
+                        "publication": result["publication"],
+                    },
+                    non_blocking=True,
+                )
+                if dispatched_task(created) is None:
+                    result["distribution"] = created["pulp_href"]
+                return dispatched_task(created)
+            distribution_ctx.pulp_href = distribution["pulp_href"]
+            body = {"publication": result["publication"]}
+            if distribution.get("repository"):
+                # A distribution serves either a repository or a publication.
+                body["repository"] = ""
+            return dispatched_task(distribution_ctx.update(body=body, non_blocking=True))
+
+        finished, errors = run_tasks(
+            self.pulp_ctx, changes, dispatch, self.module.params["concurrency"]
+        )
+        for name, (item, result) in changes.items():
+            if name in errors:
+                result["error"] = errors[name]
+            elif finished[name] is not None:
+                task = finished[name]
+                if task["created_resources"]:
+                    result["distribution"] = task["created_resources"][0]
+                result["timings"]["distribute"] = task_seconds(task)
+        for result in results:
+            result["timings"]["total"] = round(
+                result["timings"]["publish"] + result["timings"]["distribute"], 3
+            )
+
+
+def task_seconds(task):
+    """
+    Seconds from dispatching a task until it finished.
+    """
+    return round(
+        (
+            parse_datetime(task["finished_at"]) - parse_datetime(task["pulp_created"])
+        ).total_seconds(),
+        3,
+    )
+
+
+def main():
+    with PulpAnsibleModule(
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
+        argument_spec=dict(
+            plugin=dict(required=True, choices=["file", "python", "rpm"]),
+            repositories=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    repository=dict(required=True),
+                    distribution=dict(),
+                    base_path=dict(),
+                ),
+            ),
+            publication_attributes=dict(type="dict"),
+            concurrency=dict(type="int", default=4),
+        ),
+    ) as module:
+        check_concurrency(module.params["concurrency"])
+        items = [
+            dict(item, distribution=item["distribution"] or item["repository"])
+            for item in module.params["repositories"]
+        ]
+        publisher = Publisher(module)
+        publisher.lookup(items)
+        results = [publisher.plan(item) for item in items]
+        if not module.check_mode:
+            publisher.publish(results)
+            publisher.distribute(items, results)
+        module.set_result("repositories", results)
+        if any(result.get("created") or result.get("updated") for result in results):
+            module.set_changed()
+        errors = {result["repository"]: result["error"] for result in results if "error" in result}
+        if errors:
+            raise failed_for("Publishing", errors)
+
+
+if __name__ == "__main__":
+    main()
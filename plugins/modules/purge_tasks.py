@@ -15,6 +15,7 @@ module: purge_tasks
 short_description: Purge finished tasks
 description:
   - "Purge tasks in specific finished states with a certain minimal age."
+  - "With I(window), the purge walks forward from the oldest matching task in steps of that size, submitting one purge task per window."
 options:
   finished_before:
     description:
@@ -29,6 +30,24 @@ options:
       - canceled
       - completed
       - failed
+  window:
+    description:
+      - Purge incrementally in windows of this many hours, starting from the oldest finished task.
+      - Each window is a separate purge task, so none of them runs for long.
+    type: int
+    version_added: "0.0.16"
+  pause:
+    description:
+      - Seconds to wait between two windows.
+    type: float
+    default: 0
+    version_added: "0.0.16"
+  time_budget:
+    description:
+      - Only start another window, including the I(pause) before it, within this many seconds of starting the first one. The remaining tasks are left for the next run.
+      - The first window is always purged.
+    type: float
+    version_added: "0.0.16"
 extends_documentation_fragment:
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
@@ -46,6 +65,15 @@ EXAMPLES = r"""
 - name: Report removed tasks
   debug:
     var: task_purge_summary
+- name: Remove old tasks one day at a time, for at most ten minutes
+  pulp.squeezer.purge_tasks:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    finished_before: "2024-01-01"
+    window: 24
+    pause: 5
+    time_budget: 600
 """
 
 RETURN = r"""
@@ -53,13 +81,28 @@ RETURN = r"""
     description: Task purge details
     type: dict
     returned: always
+  windows:
+    description:
+      - The purged windows in order, each with its C(finished_before) and C(summary).
+      - If the time budget ran out, the last window does not reach I(finished_before).
+    type: list
+    returned: when I(window) is set
+  complete:
+    description: Whether all windows up to I(finished_before) were purged
+    type: bool
+    returned: when I(window) is set
 """
 
 
+import time
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpAnsibleModule
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+    parse_datetime,
+)
 
 try:
     from pulp_glue.core.context import PulpTaskContext
@@ -69,6 +112,80 @@ except ImportError:
     PULP_CLI_IMPORT_ERR = traceback.format_exc()
 
 
+# Pulp purges tasks older than this if no finished_before is given.
+DEFAULT_PURGE_AGE = timedelta(days=30)
+
+
+def purge_summary(purge_task):
+    summary = {"objects": {}, "total": 0, "errors": 0}
+    for report in purge_task["progress_reports"]:
+        if report["code"] == "purge.tasks.total":
+            summary["total"] = report["total"]
+        elif report["code"] == "purge.tasks.error":
+            summary["errors"] = report["total"]
+        elif report["code"].startswith("purge.tasks.key"):
+            summary["objects"][report["code"][16:]] = report["total"]
+    return summary
+
+
+def purge_windows(module, task_ctx, finished_before):
+    """
+    Purge tasks in windows from the oldest matching finished task up to finished_before.
+
+    Every purge only has to delete the tasks of its own window, because older ones are gone already.
+    """
+    states = module.params["states"] or ["completed"]
+    window = timedelta(hours=module.params["window"])
+    pause = module.params["pause"]
+    time_budget = module.params["time_budget"]
+
+    if finished_before is None:
+        finished_before = datetime.now(timezone.utc) - DEFAULT_PURGE_AGE
+    elif finished_before.tzinfo is None:
+        finished_before = finished_before.replace(tzinfo=timezone.utc)
+    oldest = task_ctx.call(
+        "list",
+        parameters={
+            "state__in": states,
+            "finished_at__lt": finished_before,
+            "ordering": ["finished_at"],
+            "fields": ["finished_at"],
+            "limit": 1,
+        },
+    )["results"]
+
+    summary = {"objects": {}, "total": 0, "errors": 0}
+    windows = []
+    complete = True
+    if oldest:
+        window_end = parse_datetime(oldest[0]["finished_at"])
+        start_time = time.monotonic()
+        while window_end < finished_before:
+            if windows:
+                # Do not pause for a window that could not start within the budget anyway.
+                if time_budget is not None and time.monotonic() + pause - start_time >= time_budget:
+                    complete = False
+                    break
+                if pause:
+                    time.sleep(pause)
+            window_end = min(window_end + window, finished_before)
+            window_summary = {"objects": {}, "total": 0, "errors": 0}
+            if not module.check_mode:
+                window_summary = purge_summary(
+                    task_ctx.purge(finished_before=window_end, states=module.params["states"])
+                )
+            windows.append({"finished_before": window_end.isoformat(), "summary": window_summary})
+            summary["total"] += window_summary["total"]
+            summary["errors"] += window_summary["errors"]
+            for key, value in window_summary["objects"].items():
+                summary["objects"][key] = summary["objects"].get(key, 0) + value
+    module.set_result("windows", windows)
+    module.set_result("complete", complete)
+    if windows:
+        module.set_changed()
+    return summary
+
+
 def main():
     with PulpAnsibleModule(
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
@@ -79,6 +196,9 @@ def main():
                 elements="str",
                 choices=["canceled", "completed", "failed"],
             ),
+            window=dict(type="int"),
+            pause=dict(type="float", default=0),
+            time_budget=dict(type="float"),
         ),
     ) as module:
         task_ctx = PulpTaskContext(module.pulp_ctx)
@@ -86,18 +206,16 @@ def main():
         finished_before = module.params["finished_before"]
         if finished_before is not None:
             finished_before = datetime.fromisoformat(finished_before)
-        if not module.check_mode:
-            purge_task = task_ctx.purge(
-                finished_before=finished_before, states=module.params["states"]
-            )
-            for report in purge_task["progress_reports"]:
-                if report["code"] == "purge.tasks.total":
-                    summary["total"] = report["total"]
-                elif report["code"] == "purge.tasks.error":
-                    summary["errors"] = report["total"]
-                elif report["code"].startswith("purge.tasks.key"):
-                    summary["objects"][report["code"][16:]] = report["total"]
-        module.set_changed()
+        if module.params["window"] is not None:
+            if module.params["window"] < 1:
+                raise SqueezerException("'window' must be at least 1.")
+            summary = purge_windows(module, task_ctx, finished_before)
+        else:
+            if not module.check_mode:
+                summary = purge_summary(
+                    task_ctx.purge(finished_before=finished_before, states=module.params["states"])
+                )
+            module.set_changed()
         module.set_result("summary", summary)
 
 
@@ -15,6 +15,7 @@ module: python_distribution
 short_description: Manage python distributions of a pulp api server instance
 description:
   - "This performs CRUD operations on python distributions in a pulp api server instance."
+  - "With I(pulp_label_select), all matching distributions are listed, updated or deleted at once. No distributions are created."
 options:
   name:
     description:
@@ -45,6 +46,8 @@ options:
     required: false
 extends_documentation_fragment:
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.label_select
+  - pulp.squeezer.pulp.snapshot
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -96,7 +99,12 @@ RETURN = r"""
   distributions:
     description: List of python distributions
     type: list
-    returned: when no name is given
+    returned: when no name is given, or with pulp_label_select
+  distribuions:
+    description:
+      - Deprecated misspelling of C(distributions), with the same value.
+    type: list
+    returned: when no name is given, or with pulp_label_select
   distribution:
     description: Python distribution details
     type: dict
@@ -128,19 +136,24 @@ def main():
     with PulpEntityAnsibleModule(
         context_class=PulpPythonDistributionContext,
         entity_singular="distribution",
-        entity_plural="distribuions",
+        entity_plural="distributions",
+        deprecated_plural="distribuions",
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             name=dict(),
             base_path=dict(),
             publication=dict(),
             content_guard=dict(),
+            pulp_label_select=dict(),
+            concurrency=dict(type="int", default=4),
             remote=dict(),
         ),
         required_if=[
-            ("state", "present", ["name", "base_path"]),
-            ("state", "absent", ["name"]),
+            ("state", "present", ["name", "pulp_label_select"], True),
+            ("state", "present", ["base_path", "pulp_label_select"], True),
+            ("state", "absent", ["name", "pulp_label_select"], True),
         ],
+        mutually_exclusive=[("name", "pulp_label_select"), ("base_path", "pulp_label_select")],
     ) as module:
         content_guard_name = module.params["content_guard"]
         remote_name = module.params["remote"]
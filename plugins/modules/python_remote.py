@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
   - pulp.squeezer.pulp.remote
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.snapshot
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -90,6 +91,7 @@ RETURN = r"""
 
 import traceback
 
+from ansible_collections.pulp.squeezer.plugins.module_utils.canonical import ENTITY_CANONICALIZERS
 from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpRemoteAnsibleModule
 
 try:
@@ -110,6 +112,7 @@ DESIRED_KEYS = {
 def main():
     with PulpRemoteAnsibleModule(
         context_class=PulpPythonRemoteContext,
+        canonicalizers=ENTITY_CANONICALIZERS["python_remote"],
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             policy=dict(choices=["immediate", "on_demand", "streamed"]),
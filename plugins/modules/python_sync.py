@@ -16,6 +16,7 @@ short_description: Synchronize a python remote on a pulp server
 description:
   - "This module synchronizes a python remote into a repository."
   - "In check_mode this module assumes, nothing changed upstream."
+  - "With I(pulp_label_select), all matching repositories are synchronized from the remotes configured on them, and I(remote) cannot be used."
 options:
   remote:
     description:
@@ -25,9 +26,11 @@ options:
   repository:
     description:
       - Name of the repository
+      - Exactly one of I(repository) and I(pulp_label_select) is required.
     type: str
-    required: true
+    required: false
 extends_documentation_fragment:
+  - pulp.squeezer.pulp.label_select
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
@@ -52,7 +55,12 @@ RETURN = r"""
   repository_version:
     description: Repository version after synching
     type: dict
-    returned: always
+    returned: when repository is given
+  repositories:
+    description: Repository version after synching by the name of each selected repository
+    type: dict
+    returned: when pulp_label_select is given
+    version_added: "0.0.16"
 """
 
 
@@ -61,6 +69,7 @@ import traceback
 from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
     PulpAnsibleModule,
     SqueezerException,
+    sync_selected,
 )
 
 try:
@@ -76,9 +85,17 @@ def main():
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             remote=dict(required=False),
-            repository=dict(required=True),
+            repository=dict(),
+            pulp_label_select=dict(),
+            concurrency=dict(type="int", default=4),
         ),
+        required_one_of=[("repository", "pulp_label_select")],
+        mutually_exclusive=[("repository", "pulp_label_select"), ("remote", "pulp_label_select")],
     ) as module:
+        if module.params["pulp_label_select"] is not None:
+            sync_selected(module, PulpPythonRepositoryContext)
+            return
+
         repository_ctx = PulpPythonRepositoryContext(
             module.pulp_ctx, entity={"name": module.params["repository"]}
         )
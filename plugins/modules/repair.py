@@ -18,13 +18,37 @@ options:
   repository:
     description:
       - Name of the repository to have a version repaired
+      - Exactly one of I(repository), I(repositories), I(pulp_label_select) and I(all_repositories) is required.
     type: str
-    required: true
+    required: false
   version:
     description:
       - Version number to be repaired
+      - Only valid together with I(repository).
     type: int
     required: false
+  repositories:
+    description:
+      - Names of repositories to have their latest versions repaired.
+    type: list
+    elements: str
+    version_added: "0.0.16"
+  pulp_label_select:
+    description:
+      - Repair the latest versions of all repositories matching this label selector.
+    type: str
+    version_added: "0.0.16"
+  all_repositories:
+    description:
+      - Repair the latest versions of all repositories on the server.
+    type: bool
+    version_added: "0.0.16"
+  concurrency:
+    description:
+      - Maximum number of repair tasks to have in flight at once when repairing multiple repositories.
+    type: int
+    default: 4
+    version_added: "0.0.16"
 extends_documentation_fragment:
   - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
@@ -46,6 +70,13 @@ EXAMPLES = r"""
     password: password
     repository: my_file_repo
     version: 1
+- name: Repair all repositories of a team, eight at a time
+  repair:
+    api_url: localhost:24817
+    username: admin
+    password: password
+    pulp_label_select: "team=storage"
+    concurrency: 8
 """
 
 RETURN = r"""
@@ -61,14 +92,28 @@ RETURN = r"""
     description: Number of successfully repaired artifacts
     type: int
     returned: if available
+  repositories:
+    description:
+      - Counts of corrupted, missing and repaired artifacts per repository name.
+      - The top level counts are the totals over all repositories.
+      - Repositories that failed to be repaired are left out. Their errors are reported in the message.
+    type: dict
+    returned: when repairing multiple repositories
 """
 
-import re
 import traceback
-from contextlib import suppress
-from importlib import import_module
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import PulpAnsibleModule
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    PulpAnsibleModule,
+    SqueezerException,
+    check_concurrency,
+    failed_for,
+    list_entities,
+    lookup_by_name,
+    run_tasks,
+    select_by_label,
+    typed_context_class,
+)
 
 try:
     from pulp_glue.common.context import PulpRepositoryContext
@@ -76,59 +121,109 @@ try:
     PULP_CLI_IMPORT_ERR = None
 except ImportError:
     PULP_CLI_IMPORT_ERR = traceback.format_exc()
-else:
-    # TODO We need some mechanism for glue to pickup plugins automatically.
-    for plugin in [
-        "ansible",
-        "container",
-        "deb",
-        "file",
-        "gem",
-        "maven",
-        "ostree",
-        "python",
-        "rpm",
-    ]:
-        with suppress(ImportError):
-            import_module(f"pulp_glue.{plugin}.context")
+
+
+REPORT_CODES = {
+    "repair.corrupted": "corrupted",
+    "repair.missing": "missing",
+    "repair.repaired": "repaired",
+}
+
+
+def report_counts(module, task):
+    counts = {}
+    for report in task["progress_reports"]:
+        if report["code"] in REPORT_CODES:
+            counts[REPORT_CODES[report["code"]]] = report["done"]
+        else:
+            module.warn(f"Unknown report result '{report['code']}'.")
+    return counts
+
+
+def select_repositories(module):
+    repository_ctx = PulpRepositoryContext(module.pulp_ctx)
+    if module.params["repositories"] is not None:
+        repositories = lookup_by_name(repository_ctx, module.params["repositories"])
+        missing = set(module.params["repositories"]) - set(repositories)
+        if missing:
+            raise SqueezerException(f"Could not find repositories: {', '.join(sorted(missing))}.")
+        return repositories
+    if module.params["pulp_label_select"] is not None:
+        return select_by_label(repository_ctx, module.params["pulp_label_select"])
+    if module.params["all_repositories"]:
+        return {repository["name"]: repository for repository in list_entities(repository_ctx, {})}
+    raise SqueezerException("No repositories selected.")
+
+
+def repair_one(module):
+    repository_ctx = PulpRepositoryContext(
+        module.pulp_ctx, entity={"name": module.params["repository"]}
+    )
+    # "cast" to the proper subclass
+    repository_ctx = typed_context_class(PulpRepositoryContext, repository_ctx.pulp_href)(
+        module.pulp_ctx, pulp_href=repository_ctx.pulp_href
+    )
+    repository_version_ctx = repository_ctx.get_version_context()
+    if module.params["version"] is None:
+        repository_version_ctx.pulp_href = repository_ctx.entity["latest_version_href"]
+    else:
+        repository_version_ctx.entity = {"number": module.params["version"]}
+
+    for key, value in report_counts(module, repository_version_ctx.repair()).items():
+        module.set_result(key, value)
+
+
+def repair_many(module, repositories):
+    """
+    Repair the latest versions of the repositories, keeping at most `concurrency` tasks in flight.
+    """
+
+    def dispatch(repository):
+        repository_ctx = typed_context_class(PulpRepositoryContext, repository["pulp_href"])(
+            module.pulp_ctx, pulp_href=repository["pulp_href"]
+        )
+        repository_version_ctx = repository_ctx.get_version_context()
+        return repository_version_ctx.call(
+            "repair",
+            non_blocking=True,
+            parameters={repository_version_ctx.HREF: repository["latest_version_href"]},
+            body={},
+        )
+
+    finished, errors = run_tasks(
+        module.pulp_ctx, repositories, dispatch, module.params["concurrency"]
+    )
+    results = {name: report_counts(module, task) for name, task in finished.items()}
+    module.set_result("repositories", dict(sorted(results.items())))
+    for key in REPORT_CODES.values():
+        module.set_result(key, sum(counts.get(key, 0) for counts in results.values()))
+    if errors:
+        raise failed_for("Repair", errors)
 
 
 def main():
+    selectors = ["repository", "repositories", "pulp_label_select", "all_repositories"]
     with PulpAnsibleModule(
         import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         supports_check_mode=False,
         argument_spec=dict(
-            repository=dict(required=True),
+            repository=dict(),
             version=dict(type="int"),
+            repositories=dict(type="list", elements="str"),
+            pulp_label_select=dict(),
+            all_repositories=dict(type="bool"),
+            concurrency=dict(type="int", default=4),
         ),
+        required_one_of=[selectors],
+        mutually_exclusive=[selectors],
     ) as module:
-        repository_ctx = PulpRepositoryContext(
-            module.pulp_ctx, entity={"name": module.params["repository"]}
-        )
-        # "cast" to the proper subclass
-        # TODO implement this in glue
-        m = re.search(repository_ctx.HREF_PATTERN, repository_ctx.pulp_href)
-        plugin = m.group("plugin")
-        resource_type = m.group("resource_type")
-        repository_ctx = PulpRepositoryContext.TYPE_REGISTRY[f"{plugin}:{resource_type}"](
-            module.pulp_ctx, pulp_href=repository_ctx.pulp_href
-        )
-        # ----
-        repository_version_ctx = repository_ctx.get_version_context()
-        if module.params["version"] is None:
-            repository_version_ctx.pulp_href = repository_ctx.entity["latest_version_href"]
+        if module.params["repository"] is not None:
+            repair_one(module)
         else:
-            repository_version_ctx.entity = {"number": module.params["version"]}
-
-        for report in repository_version_ctx.repair()["progress_reports"]:
-            if report["code"] == "repair.corrupted":
-                module.set_result("corrupted", report["done"])
-            elif report["code"] == "repair.missing":
-                module.set_result("missing", report["done"])
-            elif report["code"] == "repair.repaired":
-                module.set_result("repaired", report["done"])
-            else:
-                module.warn(f"Unknown report result '{report['code']}'.")
+            if module.params["version"] is not None:
+                raise SqueezerException("'version' can only be used with 'repository'.")
+            check_concurrency(module.params["concurrency"])
+            repair_many(module, select_repositories(module))
 
 
 if __name__ == "__main__":
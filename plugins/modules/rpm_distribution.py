@@ -47,12 +47,15 @@ options:
   generate_repo_config:
     description:
       - Specify whether Pulp should generate *.repo files
+      - Servers with pulp_rpm<3.23 always generate them.
     type: bool
     required: false
     version_added: "0.0.16"
 extends_documentation_fragment:
-  - pulp.squeezer.pulp
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.snapshot
+  - pulp.squeezer.pulp.glue
+  - pulp.squeezer.pulp
 author:
   - Jacob Floyd (@cognifloyd)
 """
@@ -100,16 +103,30 @@ RETURN = r"""
 """
 
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp import (
-    PulpContentGuard,
+import traceback
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
     PulpEntityAnsibleModule,
-    PulpRpmDistribution,
-    PulpRpmRepository,
+    SqueezerException,
 )
 
+try:
+    from pulp_glue.common.context import PluginRequirement
+    from pulp_glue.core.context import PulpContentGuardContext
+    from pulp_glue.rpm.context import PulpRpmDistributionContext, PulpRpmRepositoryContext
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+    PulpRpmDistributionContext = None
+
 
 def main():
     with PulpEntityAnsibleModule(
+        context_class=PulpRpmDistributionContext,
+        entity_singular="distribution",
+        entity_plural="distributions",
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             name=dict(),
             base_path=dict(),
@@ -126,32 +143,41 @@ def main():
     ) as module:
         content_guard_name = module.params["content_guard"]
         repository_name = module.params["repository"]
+        generate_repo_config = module.params["generate_repo_config"]
 
         natural_key = {"name": module.params["name"]}
         desired_attributes = {
             key: module.params[key]
-            for key in ["base_path", "generate_repo_config", "publication", "repository"]
+            for key in ["base_path", "publication"]
             if module.params[key] is not None
         }
 
         # support switching between using publication and repository
         if module.params["publication"] is not None:
-            desired_attributes["repository"] = None
+            desired_attributes["repository"] = ""
         elif repository_name is not None:
-            desired_attributes["publication"] = None
-            repository = PulpRpmRepository(module, {"name": repository_name})
-            repository.find(failsafe=False)
-            desired_attributes["repository"] = repository.href
+            desired_attributes["publication"] = ""
+            repository_ctx = PulpRpmRepositoryContext(
+                module.pulp_ctx, entity={"name": repository_name}
+            )
+            desired_attributes["repository"] = repository_ctx.pulp_href
 
         if content_guard_name is not None:
             if content_guard_name:
-                content_guard = PulpContentGuard(module, {"name": content_guard_name})
-                content_guard.find(failsafe=False)
-                desired_attributes["content_guard"] = content_guard.href
+                content_guard_ctx = PulpContentGuardContext(
+                    module.pulp_ctx, entity={"name": content_guard_name}
+                )
+                desired_attributes["content_guard"] = content_guard_ctx.pulp_href
             else:
-                desired_attributes["content_guard"] = None
+                desired_attributes["content_guard"] = ""
+
+        if generate_repo_config is not None:
+            if module.pulp_ctx.has_plugin(PluginRequirement("rpm", specifier=">=3.23.0")):
+                desired_attributes["generate_repo_config"] = generate_repo_config
+            elif not generate_repo_config:
+                raise SqueezerException("Cannot disable generate_repo_config with pulp_rpm<3.23")
 
-        PulpRpmDistribution(module, natural_key, desired_attributes).process()
+        module.process(natural_key, desired_attributes)
 
 
 if __name__ == "__main__":
@@ -39,11 +39,14 @@ options:
   repo_config:
     description:
       - A JSON document or data structure describing a config.repo file
+      - Requires pulp_rpm>=3.24.
     type: raw
     version_added: "0.0.16"
 extends_documentation_fragment:
-  - pulp.squeezer.pulp
   - pulp.squeezer.pulp.entity_state
+  - pulp.squeezer.pulp.snapshot
+  - pulp.squeezer.pulp.glue
+  - pulp.squeezer.pulp
 author:
   - Jacob Floyd (@cognifloyd)
   - Aaron Sweeney (@ajsween)
@@ -93,20 +96,34 @@ RETURN = r"""
     returned: when name is given
 """
 
-import json
+import traceback
 
-from ansible.module_utils.six import string_types
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp import (
+from ansible_collections.pulp.squeezer.plugins.module_utils.canonical import (
+    ENTITY_CANONICALIZERS,
+    json_document,
+)
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
     PulpEntityAnsibleModule,
-    PulpRpmRemote,
-    PulpRpmRepository,
+    SqueezerException,
 )
 
-DESIRED_KEYS = {"autopublish", "remote", "repo_config"}
+try:
+    from pulp_glue.common.context import PluginRequirement
+    from pulp_glue.rpm.context import PulpRpmRemoteContext, PulpRpmRepositoryContext
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+    PulpRpmRepositoryContext = None
 
 
 def main():
     with PulpEntityAnsibleModule(
+        context_class=PulpRpmRepositoryContext,
+        entity_singular="repository",
+        entity_plural="repositories",
+        canonicalizers=ENTITY_CANONICALIZERS["rpm_repository"],
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             name=dict(),
             description=dict(),
@@ -118,24 +135,24 @@ def main():
     ) as module:
         natural_key = {"name": module.params["name"]}
         desired_attributes = {
-            key: module.params[key] for key in DESIRED_KEYS if module.params[key] is not None
+            key: module.params[key]
+            for key in ["description", "autopublish"]
+            if module.params[key] is not None
         }
 
-        if module.params["description"] is not None:
-            # In case of an empty string we nullify the description
-            desired_attributes["description"] = module.params["description"] or None
-
         if module.params["remote"] is not None:
-            remote = PulpRpmRemote(module, {"name": module.params["remote"]})
-            remote.find(failsafe=False)
-            desired_attributes["remote"] = remote.href
-
-        repo_config = module.params["repo_config"]
-        # Encode the repo_config unless its a string, then assume it is pre-formatted JSON
-        if repo_config is not None and not isinstance(repo_config, string_types):
-            desired_attributes["repo_config"] = json.dumps(repo_config)
-
-        PulpRpmRepository(module, natural_key, desired_attributes).process()
+            remote_ctx = PulpRpmRemoteContext(
+                module.pulp_ctx, entity={"name": module.params["remote"]}
+            )
+            desired_attributes["remote"] = remote_ctx.pulp_href
+
+        if module.params["repo_config"] is not None:
+            if not module.pulp_ctx.has_plugin(PluginRequirement("rpm", specifier=">=3.24.0")):
+                raise SqueezerException("Cannot use repo_config with pulp_rpm<3.24")
+            # A string is taken to be the JSON encoded document.
+            desired_attributes["repo_config"] = json_document(module.params["repo_config"])
+
+        module.process(natural_key, desired_attributes)
 
 
 if __name__ == "__main__":
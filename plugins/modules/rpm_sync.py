@@ -37,6 +37,7 @@ options:
     default: "additive"
     choices: ["additive", "mirror_complete", "mirror_content_only"]
 extends_documentation_fragment:
+  - pulp.squeezer.pulp.glue
   - pulp.squeezer.pulp
 author:
   - Jacob Floyd (@cognifloyd)
@@ -64,17 +65,25 @@ RETURN = r"""
 """
 
 
-from ansible_collections.pulp.squeezer.plugins.module_utils.pulp import (
+import traceback
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
     PulpAnsibleModule,
-    PulpRpmRemote,
-    PulpRpmRepository,
     SqueezerException,
-    pulp_parse_version,
 )
 
+try:
+    from pulp_glue.common.context import PluginRequirement
+    from pulp_glue.rpm.context import PulpRpmRemoteContext, PulpRpmRepositoryContext
+
+    PULP_CLI_IMPORT_ERR = None
+except ImportError:
+    PULP_CLI_IMPORT_ERR = traceback.format_exc()
+
 
 def main():
     with PulpAnsibleModule(
+        import_errors=[("pulp-glue", PULP_CLI_IMPORT_ERR)],
         argument_spec=dict(
             remote=dict(required=True),
             repository=dict(required=True),
@@ -85,28 +94,36 @@ def main():
             ),
         ),
     ) as module:
-        remote = PulpRpmRemote(module, {"name": module.params["remote"]})
-        remote.find(failsafe=False)
+        remote_ctx = PulpRpmRemoteContext(module.pulp_ctx, entity={"name": module.params["remote"]})
+        remote_href = remote_ctx.pulp_href
 
-        repository = PulpRpmRepository(module, {"name": module.params["repository"]})
-        repository.find(failsafe=False)
+        repository_ctx = PulpRpmRepositoryContext(
+            module.pulp_ctx, entity={"name": module.params["repository"]}
+        )
+        repository = repository_ctx.entity
 
         # pulp_rpm supports sync_policy from 3.16.
         # Earlier versions support only mirror.
-        rpm_version = (
-            module.pulp_api.api_spec.get("info", {}).get("x-pulp-app-versions", {}).get("rpm", ())
-        )
-        if pulp_parse_version(rpm_version) >= pulp_parse_version("3.16.0"):
-            parameters = {"sync_policy": module.params["sync_policy"]}
+        if module.pulp_ctx.has_plugin(PluginRequirement("rpm", specifier=">=3.16.0")):
+            payload = {"sync_policy": module.params["sync_policy"]}
         elif module.params["sync_policy"] == "mirror_content_only":
             raise SqueezerException(
                 "Cannot use sync policy 'mirror_content_only' with pulp_rpm<3.16"
             )
         else:
-            mirror = module.params["sync_policy"] == "mirror_complete"
-            parameters = {"mirror": mirror}
+            payload = {"mirror": module.params["sync_policy"] == "mirror_complete"}
+        payload["remote"] = remote_href
+
+        repository_version = repository["latest_version_href"]
+        # In check_mode, assume nothing changed
+        if not module.check_mode:
+            sync_task = repository_ctx.sync(repository["pulp_href"], payload)
+
+            if sync_task["created_resources"]:
+                module.set_changed()
+                repository_version = sync_task["created_resources"][0]
 
-        repository.process_sync(remote, parameters)
+        module.set_result("repository_version", repository_version)
 
 
 if __name__ == "__main__":
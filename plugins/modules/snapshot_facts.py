@@ -0,0 +1,273 @@
+#!/usr/bin/python
+
+# copyright (c) 2026, Pulp Squeezer contributors
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: snapshot_facts
+short_description: Gather a snapshot of the entities on a pulp api server instance
+description:
+  - "This module gathers the repositories, remotes, distributions and publications of some plugins into one fact and keeps it in a local file."
+  - "Later runs only ask the server for the entities changed since, and only list all entities of a type again when some of them were deleted."
+  - "Entity modules accept the snapshot in their I(snapshot) option to skip looking up their entity on the server."
+version_added: "0.0.16"
+options:
+  plugins:
+    description:
+      - Plugins whose entities to gather, e.g. C(file) or C(rpm).
+      - All resource types of each plugin are included, e.g. collection and role remotes for C(ansible).
+    type: list
+    elements: str
+    required: true
+  kinds:
+    description:
+      - Kinds of entities to gather.
+    type: list
+    elements: str
+    choices:
+      - repository
+      - remote
+      - distribution
+      - publication
+    default:
+      - repository
+      - remote
+      - distribution
+      - publication
+  path:
+    description:
+      - File to keep the snapshot in between runs, on the host the module runs on.
+      - Defaults to a file per C(pulp_url) in the squeezer cache directory.
+    type: path
+    required: false
+  full_refresh:
+    description:
+      - List all entities again instead of only those changed since the last run.
+    type: bool
+    default: false
+notes:
+  - Entities are gathered incrementally by C(pulp_last_updated), and publications by C(pulp_created). Types whose list endpoint cannot be filtered by these, like repositories before pulpcore 3.25, are listed completely every time.
+  - Deleted entities are noticed by comparing the number of entities on the server with the snapshot, which costs one more request per type.
+  - In check mode, the snapshot is gathered but not written to the file.
+extends_documentation_fragment:
+  - pulp.squeezer.pulp.glue
+  - pulp.squeezer.pulp
+author:
+  - Pulp Squeezer contributors (@pulp)
+"""
+
+EXAMPLES = r"""
+- name: Take a snapshot of all file and python entities
+  pulp.squeezer.snapshot_facts:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    plugins:
+      - file
+      - python
+
+- name: Make sure a repository exists without looking it up on the server
+  pulp.squeezer.file_repository:
+    pulp_url: https://pulp.example.org
+    username: admin
+    password: password
+    name: my_file_repo
+    state: present
+    snapshot: "{{ pulp_snapshot }}"
+"""
+
+RETURN = r"""
+  ansible_facts:
+    description: Facts to add to ansible_facts.
+    returned: always
+    type: complex
+    contains:
+      pulp_snapshot:
+        description:
+          - Snapshot of the server state.
+          - C(types) holds the C(entities) by C(pulp_href) per entity type, e.g. C(file_repository) or C(ansible_collection_remote).
+        type: dict
+        returned: always
+  refreshed:
+    description:
+      - Per entity type, whether it was listed C(completely) or C(incrementally), and the number of C(changed) and C(removed) entities.
+    type: dict
+    returned: always
+"""
+
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from importlib import import_module
+
+from ansible_collections.pulp.squeezer.plugins.module_utils.pulp_glue import (
+    ENTITY_KINDS,
+    PulpAnsibleModule,
+    SqueezerException,
+    entity_type,
+    list_entities,
+)
+
+
+def snapshot_path(base_url):
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return os.path.join(
+        os.path.expanduser(xdg_cache_home),
+        "squeezer",
+        base_url.replace(":", "_").replace("/", "_"),
+        "snapshot.json",
+    )
+
+
+def plugin_contexts(plugin, kind):
+    """
+    All plugin specific glue contexts for one kind of entities of a plugin.
+    """
+    try:
+        import_module(f"pulp_glue.{plugin}.context")
+    except ImportError:
+        raise SqueezerException(f"The plugin '{plugin}' is not supported.")
+    return [
+        context_class
+        for key, context_class in sorted(ENTITY_KINDS[kind].TYPE_REGISTRY.items())
+        if key.split(":")[0] == plugin
+    ]
+
+
+def timestamp_field(context, kind):
+    """
+    Name of a timestamp that is newer on every changed entity and can be filtered by, if any.
+    """
+    api = context.pulp_ctx.api
+    method, path = api.operations[context.ID_PREFIX + "_list"]
+    filters = {param.get("name") for param in api.api_spec["paths"][path][method]["parameters"]}
+    if "pulp_last_updated__gt" in filters:
+        return "pulp_last_updated"
+    # Publications never change after they were created.
+    if kind == "publication" and "pulp_created__gt" in filters:
+        return "pulp_created"
+    return None
+
+
+def refresh(context, kind, state):
+    """
+    Bring the snapshot of one entity type up to date. Return the new state and what was done.
+    """
+    field = timestamp_field(context, kind)
+    if field is None:
+        entities = {entity["pulp_href"]: entity for entity in list_entities(context, {})}
+        return {"watermark": None, "entities": entities}, {
+            "listed": "completely",
+            "changed": len(entities),
+            "removed": 0,
+        }
+
+    # Everything changed after this request is newer than its watermark.
+    newest = context.call(
+        "list",
+        parameters=dict(
+            limit=1, offset=0, ordering=[f"-{field}"], fields=["pulp_href", field], **context.scope
+        ),
+    )
+    watermark = newest["results"][0][field] if newest["results"] else None
+
+    if state is None or state["watermark"] is None:
+        entities = {entity["pulp_href"]: entity for entity in list_entities(context, {})}
+        return {"watermark": watermark, "entities": entities}, {
+            "listed": "completely",
+            "changed": len(entities),
+            "removed": 0,
+        }
+
+    entities = dict(state["entities"])
+    changed = 0
+    since = datetime.fromisoformat(state["watermark"].replace("Z", "+00:00"))
+    for entity in list_entities(context, {f"{field}__gt": since}):
+        entities[entity["pulp_href"]] = entity
+        changed += 1
+    removed = 0
+    if newest["count"] != len(entities):
+        # Some entities were deleted.
+        existing = {
+            entity["pulp_href"] for entity in list_entities(context, {"fields": ["pulp_href"]})
+        }
+        for pulp_href in set(entities) - existing:
+            del entities[pulp_href]
+            removed += 1
+    return {"watermark": watermark, "entities": entities}, {
+        "listed": "incrementally",
+        "changed": changed,
+        "removed": removed,
+    }
+
+
+def load_snapshot(path, pulp_url):
+    try:
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except (OSError, ValueError):
+        return {"pulp_url": pulp_url, "types": {}}
+    if snapshot.get("pulp_url") != pulp_url:
+        return {"pulp_url": pulp_url, "types": {}}
+    return snapshot
+
+
+def store_snapshot(path, snapshot):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False) as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(snapshot_file.name, path)
+
+
+def main():
+    with PulpAnsibleModule(
+        argument_spec=dict(
+            plugins=dict(type="list", elements="str", required=True),
+            kinds=dict(
+                type="list",
+                elements="str",
+                choices=["repository", "remote", "distribution", "publication"],
+                default=["repository", "remote", "distribution", "publication"],
+            ),
+            path=dict(type="path"),
+            full_refresh=dict(type="bool", default=False),
+        ),
+    ) as module:
+        path = module.params["path"] or snapshot_path(module.params["pulp_url"])
+        snapshot = load_snapshot(path, module.params["pulp_url"])
+        gathered = {}
+        refreshed = {}
+        for plugin in module.params["plugins"]:
+            for kind in module.params["kinds"]:
+                for context_class in plugin_contexts(plugin, kind):
+                    type_name = entity_type(context_class)
+                    state = (
+                        None if module.params["full_refresh"] else snapshot["types"].get(type_name)
+                    )
+                    gathered[type_name], refreshed[type_name] = refresh(
+                        context_class(module.pulp_ctx), kind, state
+                    )
+        # Keep the types gathered by other plays.
+        snapshot["types"].update(gathered)
+        if not module.check_mode:
+            store_snapshot(path, snapshot)
+
+        module.set_result("refreshed", refreshed)
+        module.set_result(
+            "ansible_facts",
+            {"pulp_snapshot": {"pulp_url": module.params["pulp_url"], "types": gathered}},
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import functools
+import os
+import sys
+
+from ansible.plugins.callback import CallbackBase
+from ansible.plugins.loader import lookup_loader
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TESTS_DIR)
+
+from vcr_python_wrapper import next_serial, record_cassette_requests, use_cassette  # noqa: E402
+
+DOCUMENTATION = """
+name: vcr_lookups
+type: aggregate
+short_description: Record the lookups of the tests host to cassettes
+description:
+  - Lookups run in the controller, so the python wrapper of the modules does not see them.
+  - Each call of a pulp.squeezer lookup for the tests host gets the next serial and cassette,
+    like a module invocation.
+requirements:
+  - Enabled by the playbook tests in vcr mode.
+"""
+
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+TEST_HOST = "tests"
+RECORDED_COLLECTION = "pulp.squeezer."
+
+
+def recorded_lookup(run):
+    @functools.wraps(run)
+    def recorded_run(terms, variables=None, **kwargs):
+        if (variables or {}).get("inventory_hostname") != TEST_HOST:
+            return run(terms, variables, **kwargs)
+        test_params, serial = next_serial(os.environ["PAM_TEST_VCR_PARAMS_FILE"])
+        with use_cassette(test_params, serial, FIXTURES_DIR) as cassette:
+            preloaded = len(cassette)
+            try:
+                return run(terms, variables, **kwargs)
+            finally:
+                if test_params.get("counts_file"):
+                    record_cassette_requests(
+                        test_params["counts_file"], serial, cassette, preloaded
+                    )
+
+    return recorded_run
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "vcr_lookups"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The lookups run in the workers forked after the callbacks are loaded.
+        get = lookup_loader.get
+
+        def get_recorded(name, *args, **kwargs):
+            lookup = get(name, *args, **kwargs)
+            if lookup is not None and name.startswith(RECORDED_COLLECTION):
+                lookup.run = recorded_lookup(lookup.run)
+            return lookup
+
+        lookup_loader.get = get_recorded
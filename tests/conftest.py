@@ -12,6 +12,31 @@ def pytest_addoption(parser):
         choices=["replay", "record", "live"],
         help="mode for vcr recording; one of ['replay', 'record', 'live']",
     )
+    parser.addoption(
+        "--latency",
+        action="store",
+        default=None,
+        help="seconds to delay each replayed response, or 'recorded' for the recorded durations",
+    )
+    parser.addoption(
+        "--bandwidth",
+        action="store",
+        type=int,
+        default=None,
+        help="bytes per second to limit replayed request and response bodies to",
+    )
+    parser.addoption(
+        "--capture-invocations",
+        action="store_true",
+        default=False,
+        help="store the module invocations of passing playbooks for the in-process harness",
+    )
+    parser.addoption(
+        "--scale",
+        action="store_true",
+        default=False,
+        help="run the scale scenarios against the fake pulp server",
+    )
 
 
 @pytest.fixture
@@ -19,6 +44,25 @@ def vcrmode(request):
     return request.config.getoption("vcrmode")
 
 
+@pytest.fixture
+def replay_params(request):
+    return {
+        key: request.config.getoption(key)
+        for key in ["latency", "bandwidth"]
+        if request.config.getoption(key) is not None
+    }
+
+
+@pytest.fixture
+def capture_invocations(request):
+    return request.config.getoption("capture_invocations")
+
+
+@pytest.fixture(scope="session")
+def scale(request):
+    return request.config.getoption("scale")
+
+
 if "PULP_LOGGING" in os.environ:
 
     @pytest.fixture
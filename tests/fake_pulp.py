@@ -0,0 +1,1005 @@
+#!/usr/bin/env python
+"""
+Stateful in-memory fake of the Pulp 3 REST API.
+
+The server is driven by an api specification (e.g. the `api.json` squeezer keeps in its cache, or
+one of the blobs in `tests/fixtures/blobs`). Every operation in that specification is routed:
+Listing with filters and pagination, create, read, update and delete are implemented generically,
+operations documented to return 202 spawn tasks that complete after a configurable delay.
+Repositories get versions, and `modify` and `sync` actions produce new ones. Generic list endpoints
+like `repositories/` list the entities of all plugins.
+
+Run it standalone and point `pulp_url` at it:
+
+    python tests/fake_pulp.py --spec tests/fixtures/blobs/<sha256>.gz --port 8080
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+DEFAULT_PAGE_SIZE = 100
+# Minutes orphans are kept, like pulpcore's ORPHAN_PROTECTION_TIME setting.
+DEFAULT_ORPHAN_PROTECTION_TIME = 1440
+# Where distributions are served, like pulpcore's CONTENT_ORIGIN setting.
+CONTENT_ORIGIN = "http://localhost:24816"
+ITEM_OPERATIONS = {
+    "GET": "read",
+    "PUT": "update",
+    "PATCH": "partial_update",
+    "DELETE": "delete",
+}
+MEMBERSHIP_FILTERS = {
+    "repository_version": 0,
+    "repository_version_added": 1,
+    "repository_version_removed": 2,
+}
+LOOKUPS = ["in", "contains", "icontains", "startswith", "gt", "gte", "lt", "lte", "ne"]
+# Access policies pulpcore 3.24 ships for the viewsets the tests change, as recorded from a real
+# server in tests/fixtures/access_policy-0.yml. Users cannot create access policies.
+DEFAULT_ACCESS_POLICIES = {
+    "tasks": {
+        "statements": [
+            {"action": ["list"], "principal": "authenticated", "effect": "allow"},
+            {
+                "action": ["retrieve", "my_permissions"],
+                "principal": "authenticated",
+                "effect": "allow",
+                "condition": "has_model_or_domain_or_obj_perms:core.view_task",
+            },
+            {
+                "action": ["destroy"],
+                "principal": "authenticated",
+                "effect": "allow",
+                "condition": "has_model_or_domain_or_obj_perms:core.delete_task",
+            },
+            {
+                "action": ["update", "partial_update"],
+                "principal": "authenticated",
+                "effect": "allow",
+                "condition": "has_model_or_domain_or_obj_perms:core.change_task",
+            },
+            {"action": ["purge"], "principal": "authenticated", "effect": "allow"},
+            {
+                "action": ["list_roles", "add_role", "remove_role"],
+                "principal": "authenticated",
+                "effect": "allow",
+                "condition": "has_model_or_domain_or_obj_perms:core.manage_roles_task",
+            },
+        ],
+        "creation_hooks": [
+            {
+                "function": "add_roles_for_object_creator",
+                "parameters": {"roles": "core.task_owner"},
+                "permissions": None,
+            }
+        ],
+        "permissions_assignment": [
+            {
+                "function": "add_roles_for_object_creator",
+                "parameters": {"roles": "core.task_owner"},
+                "permissions": None,
+            }
+        ],
+        "queryset_scoping": {"function": "scope_queryset"},
+    },
+}
+ACTION_PATTERN = re.compile(r"^(?P<href>.*/)(?P<action>[^/]+)/$")
+LABEL_TERM_PATTERN = re.compile(r"^(?P<negate>!)?(?P<key>[^=!~]+)(?:(?P<op>!=|=|~)(?P<value>.*))?$")
+
+
+def load_spec(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rb") as spec_file:
+        return json.load(spec_file)
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def parse_datetime(value):
+    result = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=timezone.utc)
+    return result
+
+
+class FakePulpError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class FakePulp:
+    """
+    The in-memory state and request dispatcher.
+
+    Entities of all kinds live in one dictionary keyed by their href. Every entity belongs to a
+    collection (the path it is listed under) and has a kind, the operation id prefix its
+    operations share in the specification (e.g. `repositories_file_file`).
+    """
+
+    def __init__(self, spec, task_delay=0.0):
+        self.spec = spec
+        self.task_delay = task_delay
+        self.worker_count = 0
+        # Fail every nth GET request with 503, telling clients to retry after that many seconds.
+        self.unavailable_every = 0
+        self.retry_after = None
+        self._get_counter = itertools.count(1)
+        # Seconds every response is held back, outside of the lock, to let requests overlap.
+        self.response_delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Session login like newer pulpcore versions offer it.
+        self.login_supported = True
+        self.sessions = set()
+        self.auth_counts = Counter()
+        self.lock = threading.RLock()
+        self.operation_counts = Counter()
+
+        self.entities = {}
+        self.kinds = {}
+        self.positions = {}
+        self.collections = {}
+        self.indexes = {}
+        self.schemas = {}
+        self.version_content = {}
+        self.remote_content = {}
+        # Units of content a sync finds on remotes without content defined by set_remote_content.
+        self.upstream_units = 0
+        self.repair_findings = {}
+        self.pending_tasks = []
+        self._position_counter = itertools.count()
+
+        self.operations = {}
+        self.literal_paths = {}
+        for path, path_spec in spec["paths"].items():
+            for method, method_spec in path_spec.items():
+                if isinstance(method_spec, dict) and "operationId" in method_spec:
+                    self.operations[method_spec["operationId"]] = (
+                        method.upper(),
+                        path,
+                        method_spec,
+                    )
+                    if "{" not in path:
+                        self.literal_paths.setdefault(path, {})[method.upper()] = method_spec
+        self.collection_kinds = {
+            path: methods["GET"]["operationId"][: -len("_list")]
+            for path, methods in self.literal_paths.items()
+            if "GET" in methods and methods["GET"]["operationId"].endswith("_list")
+        }
+        self.api_root = next(
+            (
+                path[: -len("status/")]
+                for path in self.literal_paths
+                if self.literal_paths[path].get("GET", {}).get("operationId") == "status_read"
+            ),
+            "/pulp/api/v3/",
+        )
+        self.tasks_path = self.api_root + "tasks/"
+        self._add_access_policies()
+        self.spec_bytes = json.dumps(spec).encode()
+
+    # Specification helpers
+
+    def _add_access_policies(self):
+        collection = self.api_root + "access_policies/"
+        if collection not in self.collection_kinds:
+            return
+        self.seed(
+            collection,
+            [
+                dict(policy, viewset_name=viewset_name, customized=False)
+                for viewset_name, policy in DEFAULT_ACCESS_POLICIES.items()
+            ],
+        )
+
+    def _operation(self, operation_id):
+        operation = self.operations.get(operation_id)
+        return operation and operation[2]
+
+    def _is_async(self, operation_id):
+        return "202" in self._operation(operation_id)["responses"]
+
+    def _success_status(self, operation_id):
+        return min(int(code) for code in self._operation(operation_id)["responses"] if code < "300")
+
+    def _schema(self, kind):
+        if kind not in self.schemas:
+            self.schemas[kind] = self._lookup_schema(kind)
+        return self.schemas[kind]
+
+    def _lookup_schema(self, kind):
+        method_spec = self._operation(kind + "_read")
+        if method_spec is None:
+            return {}
+        try:
+            schema = method_spec["responses"]["200"]["content"]["application/json"]["schema"]
+        except KeyError:
+            return {}
+        while "$ref" in schema:
+            schema = self.spec["components"]["schemas"][schema["$ref"].rsplit("/", 1)[-1]]
+        return schema.get("properties", {})
+
+    def _default(self, prop):
+        if "default" in prop:
+            return prop["default"]
+        if prop.get("nullable"):
+            return None
+        return {"array": [], "object": {}}.get(prop.get("type"))
+
+    # Entity store
+
+    def _add_entity(self, collection, kind, body, href=None):
+        href = href or f"{collection}{uuid.uuid4()}/"
+        properties = self._schema(kind)
+        entity = {key: self._default(prop) for key, prop in properties.items()}
+        entity.update(body)
+        entity.update({"pulp_href": href, "pulp_created": now()})
+        if "pulp_last_updated" in properties:
+            entity["pulp_last_updated"] = entity["pulp_created"]
+        if "sha256" in properties and entity.get("artifact") in self.entities:
+            entity["sha256"] = self.entities[entity["artifact"]].get("sha256")
+        if kind.startswith("publications_") and entity.get("repository") in self.entities:
+            if not entity.get("repository_version"):
+                entity["repository_version"] = self.entities[entity["repository"]].get(
+                    "latest_version_href"
+                )
+        self.entities[href] = entity
+        self.kinds[href] = kind
+        self.positions[href] = next(self._position_counter)
+        self.collections.setdefault(collection, {})[href] = None
+        self.indexes.pop(collection, None)
+        if self._operation(kind + "_versions_list"):
+            entity["versions_href"] = href + "versions/"
+            self._add_version(href, set(), set(), set())
+        return entity
+
+    def _add_version(self, repository_href, content, added, removed):
+        repository = self.entities[repository_href]
+        versions_href = repository["versions_href"]
+        number = len(self.collections.get(versions_href, {}))
+        version = self._add_entity(
+            versions_href,
+            self.kinds[repository_href] + "_versions",
+            {
+                "number": number,
+                "repository": repository_href,
+                "base_version": repository.get("latest_version_href"),
+                "content_summary": {
+                    "added": self._summary(added),
+                    "removed": self._summary(removed),
+                    "present": self._summary(content),
+                },
+            },
+            href=f"{versions_href}{number}/",
+        )
+        self.version_content[version["pulp_href"]] = (frozenset(content), added, removed)
+        repository["latest_version_href"] = version["pulp_href"]
+        return version
+
+    def _summary(self, content):
+        summary = {}
+        for href in content:
+            collection = href.rsplit("/", 2)[0] + "/"
+            content_type = ".".join(collection[len(self.api_root) :].strip("/").split("/")[1:])
+            entry = summary.setdefault(content_type, {"count": 0, "href": collection})
+            entry["count"] += 1
+        return summary
+
+    def _remove_entity(self, href):
+        for child in [key for key in self.entities if key.startswith(href)]:
+            self.entities.pop(child)
+            self.kinds.pop(child)
+            self.positions.pop(child)
+            self.version_content.pop(child, None)
+            self.collections[self._collection_of(child)].pop(child, None)
+            self.indexes.pop(self._collection_of(child), None)
+        self.collections.pop(href + "versions/", None)
+
+    @staticmethod
+    def _collection_of(href):
+        return href.rsplit("/", 2)[0] + "/"
+
+    def _index(self, collection, field):
+        """Map the string values of a field to the hrefs carrying them, built lazily."""
+        indexes = self.indexes.setdefault(collection, {})
+        if field not in indexes:
+            index = {}
+            for href in self.collections.get(collection, {}):
+                value = self.entities[href].get(field)
+                index.setdefault(value if isinstance(value, str) else None, set()).add(href)
+            indexes[field] = index
+        return indexes[field]
+
+    def seed(self, collection, bodies):
+        """Add entities directly to the store, bypassing the api. Returns their hrefs."""
+        with self.lock:
+            kind = self.collection_kinds[collection]
+            return [self._add_entity(collection, kind, body)["pulp_href"] for body in bodies]
+
+    def seed_version(self, repository_href, content_hrefs):
+        """Add a new repository version with the given content directly to the store."""
+        with self.lock:
+            base_content = self._content(self.entities[repository_href]["latest_version_href"])
+            content = set(content_hrefs)
+            return self._add_version(
+                repository_href, content, content - base_content, base_content - content
+            )["pulp_href"]
+
+    def set_remote_content(self, remote_href, content_hrefs):
+        """Define the content a sync from this remote will find upstream."""
+        with self.lock:
+            self.remote_content[remote_href] = set(content_hrefs)
+
+    def set_repair_findings(self, repository_href, corrupted=0, missing=0):
+        """Define the artifacts a repair of this repository's versions finds and repairs."""
+        with self.lock:
+            self.repair_findings[repository_href] = (corrupted, missing)
+
+    def _content(self, version_href):
+        return set(self.version_content.get(version_href, (frozenset(), set(), set()))[0])
+
+    # Tasks
+
+    def _spawn_task(self, name, effect, progress_reports=None):
+        """
+        Queue a task running `effect`. The effect may append to the list of progress reports.
+        """
+        task = self._add_entity(
+            self.tasks_path,
+            "tasks",
+            {"name": name, "state": "waiting", "logging_cid": uuid.uuid4().hex, "error": None},
+        )
+        if progress_reports is None:
+            progress_reports = []
+        self.pending_tasks.append(
+            (time.monotonic() + self.task_delay, task, effect, progress_reports)
+        )
+        return {"task": task["pulp_href"]}
+
+    def _run_due_tasks(self):
+        current_time = time.monotonic()
+        while self.pending_tasks and self.pending_tasks[0][0] <= current_time:
+            _, task, effect, progress_reports = self.pending_tasks.pop(0)
+            task["started_at"] = now()
+            try:
+                task["created_resources"] = [href for href in (effect() or []) if href]
+                task["progress_reports"] = progress_reports
+                task["state"] = "completed"
+            except FakePulpError as e:
+                task["error"] = {"description": str(e.detail)}
+                task["state"] = "failed"
+            task["finished_at"] = now()
+
+    # Request dispatching
+
+    def handle(self, method, url, body=None):
+        """Return a tuple (status, payload) for a request."""
+        split_url = urlsplit(url)
+        path = split_url.path
+        query = {
+            # Exploded array parameters are repeated for each item.
+            key: ",".join(values) if key in {"fields", "exclude_fields"} else values[-1]
+            for key, values in parse_qs(split_url.query).items()
+        }
+        with self.lock:
+            if (
+                method == "GET"
+                and self.unavailable_every
+                and path != self.api_root + "docs/api.json"
+                and next(self._get_counter) % self.unavailable_every == 0
+            ):
+                self.operation_counts["unavailable"] += 1
+                return 503, {"detail": "Service Unavailable"}
+            self._run_due_tasks()
+            try:
+                return self._dispatch(method, path, query, body or {})
+            except FakePulpError as e:
+                return e.status, {"detail": e.detail}
+
+    def _dispatch(self, method, path, query, body):
+        if path == self.api_root + "docs/api.json":
+            return 200, self.spec_bytes
+        if path in self.literal_paths:
+            method_spec = self.literal_paths[path].get(method)
+            if method_spec is None:
+                raise FakePulpError(405, f"Method '{method}' not allowed.")
+            operation_id = method_spec["operationId"]
+            self.operation_counts[operation_id] += 1
+            return self._dispatch_literal(operation_id, path, query, body)
+        if path in self.entities:
+            operation_id = f"{self.kinds[path]}_{ITEM_OPERATIONS[method]}"
+            if operation_id not in self.operations:
+                raise FakePulpError(405, f"Method '{method}' not allowed.")
+            self.operation_counts[operation_id] += 1
+            return self._dispatch_item(operation_id, path, method, body)
+        match = ACTION_PATTERN.match(path)
+        if match and match.group("href") in self.entities:
+            href = match.group("href")
+            operation_id = f"{self.kinds[href]}_{match.group('action')}"
+            if method == "GET" and operation_id + "_list" in self.operations:
+                operation_id += "_list"
+                self.operation_counts[operation_id] += 1
+                return 200, self._list(path, query)
+            if operation_id not in self.operations or self.operations[operation_id][0] != method:
+                raise FakePulpError(404, "Not found.")
+            self.operation_counts[operation_id] += 1
+            return self._dispatch_action(operation_id, href, match.group("action"), body)
+        raise FakePulpError(404, "Not found.")
+
+    def _dispatch_literal(self, operation_id, path, query, body):
+        if operation_id == "status_read":
+            return 200, self._status()
+        if operation_id == "tasks_purge":
+            progress_reports = []
+            return 202, self._spawn_task(
+                operation_id, lambda: self._purge_tasks(body, progress_reports), progress_reports
+            )
+        if operation_id == "orphans_cleanup_cleanup":
+            progress_reports = []
+            return 202, self._spawn_task(
+                operation_id,
+                lambda: self._cleanup_orphans(body, progress_reports),
+                progress_reports,
+            )
+        if operation_id.endswith("_list") and path in self.collection_kinds:
+            return 200, self._list(path, query)
+        if operation_id.endswith("_create") and path in self.collection_kinds:
+            kind = self.collection_kinds[path]
+            # Uploaded files are not kept, only their other fields.
+            body = {key: value for key, value in body.items() if not isinstance(value, bytes)}
+            if self._is_async(operation_id):
+                return 202, self._spawn_task(
+                    operation_id, lambda: [self._add_entity(path, kind, body)["pulp_href"]]
+                )
+            return 201, self._represent(self._add_entity(path, kind, body)["pulp_href"])
+        if self._is_async(operation_id):
+            return 202, self._spawn_task(operation_id, lambda: [])
+        return self._success_status(operation_id), {}
+
+    def _dispatch_item(self, operation_id, href, method, body):
+        if method == "GET":
+            return 200, self._represent(href)
+
+        if method == "DELETE":
+
+            def effect():
+                self._remove_entity(href)
+
+        else:
+
+            def effect():
+                self.entities[href].update(body)
+                self.indexes.pop(self._collection_of(href), None)
+                if "pulp_last_updated" in self.entities[href]:
+                    self.entities[href]["pulp_last_updated"] = now()
+
+        if self._is_async(operation_id):
+            return 202, self._spawn_task(operation_id, effect)
+        effect()
+        if method == "DELETE":
+            return 204, None
+        return 200, self._represent(href)
+
+    def _dispatch_action(self, operation_id, href, action, body):
+        if action == "modify":
+
+            def effect():
+                return [self._modify(href, body)]
+
+        elif action == "sync":
+
+            def effect():
+                return [self._sync(href, body)]
+
+        else:
+
+            def effect():
+                return []
+
+        if action == "repair":
+            corrupted, missing = self.repair_findings.get(
+                self.entities[href].get("repository"), (0, 0)
+            )
+            progress_reports = [
+                {"code": "repair.corrupted", "done": corrupted},
+                {"code": "repair.missing", "done": missing},
+                {"code": "repair.repaired", "done": corrupted + missing},
+            ]
+            return 202, self._spawn_task(operation_id, effect, progress_reports)
+        if self._is_async(operation_id):
+            return 202, self._spawn_task(operation_id, effect)
+        effect()
+        return self._success_status(operation_id), {}
+
+    def _modify(self, repository_href, body):
+        repository = self.entities[repository_href]
+        base_version = body.get("base_version") or repository["latest_version_href"]
+        base_content = self._content(base_version)
+        content = set(base_content)
+        remove_content = body.get("remove_content_units") or []
+        if "*" in remove_content:
+            content.clear()
+        else:
+            content.difference_update(remove_content)
+        for content_href in body.get("add_content_units") or []:
+            if content_href not in self.entities:
+                raise FakePulpError(
+                    400, f"Invalid hyperlink - Object does not exist: {content_href}"
+                )
+            content.add(content_href)
+        return self._new_version(repository_href, content)
+
+    def _sync(self, repository_href, body):
+        repository = self.entities[repository_href]
+        remote_href = body.get("remote") or repository.get("remote")
+        if remote_href is None:
+            raise FakePulpError(400, "A remote must be specified.")
+        content = self._content(repository["latest_version_href"])
+        if remote_href not in self.remote_content and self.upstream_units:
+            self.remote_content[remote_href] = self._upstream_content(remote_href)
+        upstream = self.remote_content.get(remote_href, set())
+        if body.get("mirror") or body.get("sync_policy", "additive") != "additive":
+            content = set(upstream)
+        else:
+            content.update(upstream)
+        return self._new_version(repository_href, content)
+
+    def _upstream_content(self, remote_href):
+        """Create the units of content of the remote's plugin found upstream."""
+        plugin = remote_href[len(self.api_root + "remotes/") :].split("/")[0]
+        collection = next(
+            collection
+            for collection in self.collection_kinds
+            if collection.startswith(f"{self.api_root}content/{plugin}/")
+        )
+        kind = self.collection_kinds[collection]
+        return {
+            self._add_entity(collection, kind, {})["pulp_href"] for _ in range(self.upstream_units)
+        }
+
+    def _referenced(self, collection_prefix):
+        """The hrefs below a collection something else still refers to."""
+        if collection_prefix == self.api_root + "content/":
+            return set().union(*(content for content, _, _ in self.version_content.values()))
+        return {entity.get("artifact") for entity in self.entities.values()}
+
+    def _orphans(self, collection_prefix, protection_time):
+        """The entities below a collection that are not referenced and old enough to go."""
+        if protection_time is None or protection_time < 0:
+            protection_time = DEFAULT_ORPHAN_PROTECTION_TIME
+        cutoff = (datetime.now(timezone.utc) - timedelta(minutes=protection_time)).isoformat()
+        referenced = self._referenced(collection_prefix)
+        return [
+            href
+            for collection, members in self.collections.items()
+            if collection.startswith(collection_prefix) and collection in self.collection_kinds
+            for href in members
+            if href not in referenced
+            and self.entities[href]["pulp_created"].replace("Z", "+00:00") <= cutoff
+        ]
+
+    def _cleanup_orphans(self, body, progress_reports):
+        protection_time = body.get("orphan_protection_time")
+        content = self._orphans(self.api_root + "content/", protection_time)
+        if body.get("content_hrefs") is not None:
+            for content_href in body["content_hrefs"]:
+                if content_href not in self.entities:
+                    raise FakePulpError(
+                        400, f"Invalid hyperlink - Object does not exist: {content_href}"
+                    )
+            content = [href for href in content if href in body["content_hrefs"]]
+        artifacts = {self.entities[href].get("artifact") for href in content}
+        for href in content:
+            self._remove_entity(href)
+        artifacts = [
+            href
+            for href in self._orphans(self.api_root + "artifacts/", protection_time)
+            if body.get("content_hrefs") is None or href in artifacts
+        ]
+        for href in artifacts:
+            self._remove_entity(href)
+        progress_reports.extend(
+            {
+                "message": message,
+                "code": code,
+                "state": "completed",
+                "total": len(hrefs),
+                "done": len(hrefs),
+            }
+            for message, code, hrefs in [
+                ("Clean up orphan Content", "clean-up.content", content),
+                ("Clean up orphan Artifacts", "clean-up.artifacts", artifacts),
+            ]
+        )
+
+    def _purge_tasks(self, body, progress_reports):
+        finished_before = parse_datetime(body.get("finished_before") or now())
+        states = body.get("states") or ["completed"]
+        purged = [
+            href
+            for href in self.collections.get(self.tasks_path, {})
+            if self.entities[href]["state"] in states
+            and self.entities[href].get("finished_at")
+            and parse_datetime(self.entities[href]["finished_at"]) < finished_before
+        ]
+        for href in purged:
+            self._remove_entity(href)
+        progress_reports.extend(
+            {"message": message, "code": code, "state": "completed", "total": total, "done": total}
+            for message, code, total in [
+                ("Purged task-objects total", "purge.tasks.total", len(purged)),
+                ("Purged task-objects of type core.Task", "purge.tasks.key.core.Task", len(purged)),
+                ("Errors encountered while purging tasks", "purge.tasks.error", 0),
+            ]
+        )
+
+    def _new_version(self, repository_href, content):
+        latest_content = self._content(self.entities[repository_href]["latest_version_href"])
+        if content == latest_content:
+            return None
+        return self._add_version(
+            repository_href, content, content - latest_content, latest_content - content
+        )["pulp_href"]
+
+    # Responses
+
+    def _represent(self, href, fields=None, exclude_fields=None):
+        entity = self.entities[href]
+        properties = self._schema(self.kinds[href])
+        result = {
+            key: value
+            for key, value in entity.items()
+            if not properties or key in properties or key == "pulp_href"
+        }
+        if "base_url" in properties and entity.get("base_path") is not None:
+            result["base_url"] = f"{CONTENT_ORIGIN}/pulp/content/{entity['base_path']}/"
+        if fields:
+            result = {key: value for key, value in result.items() if key in fields}
+        if exclude_fields:
+            result = {key: value for key, value in result.items() if key not in exclude_fields}
+        return result
+
+    def _status(self):
+        versions = self.spec.get("info", {}).get("x-pulp-app-versions", {})
+        return {
+            "versions": [
+                {"component": component, "version": version, "package": f"pulp-{component}"}
+                for component, version in versions.items()
+            ],
+            "online_workers": [
+                {"name": f"fake-worker-{i}", "pulp_href": f"{self.api_root}workers/{i}/"}
+                for i in range(self.worker_count)
+            ],
+            "online_content_apps": [],
+            "database_connection": {"connected": True},
+            "redis_connection": {"connected": False},
+            "storage": None,
+        }
+
+    def _candidates(self, path, query):
+        """Narrow down the entities to check using the membership and exact field filters."""
+        members = self.collections.get(path, {})
+        if not members and path in self.collection_kinds:
+            # Generic endpoints list the entities of the more specific ones below them.
+            members = dict.fromkeys(
+                href
+                for collection, collection_members in self.collections.items()
+                if collection.startswith(path) and collection in self.collection_kinds
+                for href in collection_members
+            )
+        if not members:
+            return []
+        sample = self.entities[next(iter(members))]
+        candidates = None
+        for key, value in query.items():
+            if key in MEMBERSHIP_FILTERS and key not in sample:
+                version_content = self.version_content.get(value, (frozenset(), set(), set()))
+                subset = version_content[MEMBERSHIP_FILTERS[key]]
+            elif "__" not in key and key in sample and path in self.collections:
+                index = self._index(path, key)
+                subset = index.get(value, set()) | index.get(None, set())
+            else:
+                continue
+            candidates = subset if candidates is None else candidates & subset
+        if candidates is None:
+            return list(members)
+        return sorted((href for href in candidates if href in members), key=self.positions.get)
+
+    def _list(self, path, query):
+        hrefs = [href for href in self._candidates(path, query) if self._matches(href, query)]
+        # Specifications of newer pulpcore versions offer this filter.
+        if "orphaned_for" in query:
+            orphans = set(self._orphans(path, float(query["orphaned_for"])))
+            hrefs = [href for href in hrefs if href in orphans]
+        ordering = query.get("ordering")
+        if ordering:
+            for key in reversed(ordering.split(",")):
+                hrefs.sort(
+                    key=lambda href: str(self.entities[href].get(key.lstrip("-"), "")),
+                    reverse=key.startswith("-"),
+                )
+        count = len(hrefs)
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+        if limit <= 0:
+            # Like the django rest framework, fall back to the default for invalid limits.
+            limit = DEFAULT_PAGE_SIZE
+        fields = query.get("fields") and query["fields"].split(",")
+        exclude_fields = query.get("exclude_fields") and query["exclude_fields"].split(",")
+        results = [
+            self._represent(href, fields, exclude_fields) for href in hrefs[offset : offset + limit]
+        ]
+
+        def page_url(page_offset):
+            return f"{path}?{urlencode({**query, 'limit': limit, 'offset': page_offset})}"
+
+        return {
+            "count": count,
+            "next": page_url(offset + limit) if offset + limit < count else None,
+            "previous": page_url(max(0, offset - limit)) if offset > 0 else None,
+            "results": results,
+        }
+
+    def _matches(self, href, query):
+        entity = self.entities[href]
+        for key, value in query.items():
+            if key in {"limit", "offset", "ordering", "fields", "exclude_fields", "orphaned_for"}:
+                continue
+            if key == "pulp_label_select":
+                if not self._labels_match(entity.get("pulp_labels") or {}, value):
+                    return False
+            elif key in MEMBERSHIP_FILTERS and key not in entity:
+                version_content = self.version_content.get(value, (frozenset(), set(), set()))
+                if href not in version_content[MEMBERSHIP_FILTERS[key]]:
+                    return False
+            else:
+                field, _, lookup = key.partition("__")
+                if field not in entity or (lookup and lookup not in LOOKUPS):
+                    # Unknown filters are ignored, like the django filtersets do.
+                    continue
+                if not self._field_matches(entity[field], lookup, value):
+                    return False
+        return True
+
+    @staticmethod
+    def _field_matches(actual, lookup, value):
+        if isinstance(actual, bool):
+            value = value.lower() == "true"
+        elif isinstance(actual, int):
+            value = [int(item) for item in value.split(",")] if lookup == "in" else int(value)
+        elif lookup == "in":
+            value = value.split(",")
+        if isinstance(actual, list) and not lookup:
+            return value in actual
+        if lookup == "in":
+            return actual in value
+        if lookup == "ne":
+            return actual != value
+        if actual is None:
+            return False
+        if lookup == "contains":
+            return value in actual
+        if lookup == "icontains":
+            return value.lower() in actual.lower()
+        if lookup == "startswith":
+            return actual.startswith(value)
+        if lookup == "gt":
+            return actual > value
+        if lookup == "gte":
+            return actual >= value
+        if lookup == "lt":
+            return actual < value
+        if lookup == "lte":
+            return actual <= value
+        return actual == value
+
+    @staticmethod
+    def _labels_match(labels, select):
+        for term in select.split(","):
+            match = LABEL_TERM_PATTERN.match(term.strip())
+            if match is None:
+                raise FakePulpError(400, f"Invalid label selector '{term}'.")
+            key, op, value = match.group("key"), match.group("op"), match.group("value")
+            if match.group("negate"):
+                if key in labels:
+                    return False
+            elif op is None:
+                if key not in labels:
+                    return False
+            elif op == "=":
+                if labels.get(key) != value:
+                    return False
+            elif op == "!=":
+                if key not in labels or labels[key] == value:
+                    return False
+            elif value not in labels.get(key, ""):
+                return False
+        return True
+
+
+class FakePulpRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self._parse_body(self.rfile.read(length)) if length else None
+        if fake.login_supported and urlsplit(self.path).path == fake.api_root + "login/":
+            self._login()
+            return
+        if not self._authenticate():
+            self._respond(401, {"detail": "Invalid session."})
+            return
+        # Downloads of the api specification are not counted as requests in flight.
+        counted = not urlsplit(self.path).path.endswith("/docs/api.json")
+        with fake.lock:
+            fake.in_flight += counted
+            fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+        try:
+            status, payload = fake.handle(self.command, self.path, body)
+            time.sleep(fake.response_delay)
+        finally:
+            with fake.lock:
+                fake.in_flight -= counted
+        self._respond(status, payload)
+
+    def _respond(self, status, payload, headers=()):
+        fake = self.server.fake
+        if payload is None:
+            data = b""
+        elif isinstance(payload, bytes):
+            data = payload
+        else:
+            data = json.dumps(payload).encode()
+        self.send_response(status)
+        if status == 503 and fake.retry_after is not None:
+            self.send_header("Retry-After", str(fake.retry_after))
+        for header in headers:
+            self.send_header(*header)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authenticate(self):
+        """Count how a request authenticates. Reject unknown sessions without basic auth."""
+        fake = self.server.fake
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        with fake.lock:
+            if "sessionid" in cookie and cookie["sessionid"].value in fake.sessions:
+                fake.auth_counts["session"] += 1
+            elif self.headers.get("Authorization", "").startswith("Basic "):
+                fake.auth_counts["basic"] += 1
+            elif "sessionid" in cookie:
+                return False
+            else:
+                fake.auth_counts["none"] += 1
+        return True
+
+    def _login(self):
+        fake = self.server.fake
+        if self.command != "POST":
+            self._respond(405, {"detail": f"Method '{self.command}' not allowed."})
+            return
+        if not self.headers.get("Authorization", "").startswith("Basic "):
+            self._respond(401, {"detail": "Authentication credentials were not provided."})
+            return
+        session_id = uuid.uuid4().hex
+        with fake.lock:
+            fake.auth_counts["basic"] += 1
+            fake.operation_counts["login_create"] += 1
+            fake.sessions.add(session_id)
+        time.sleep(fake.response_delay)
+        self._respond(
+            201,
+            {"username": "admin"},
+            headers=[
+                ("Set-Cookie", f"sessionid={session_id}; Max-Age=1209600; Path=/"),
+                ("Set-Cookie", f"csrftoken={uuid.uuid4().hex}; Max-Age=31449600; Path=/"),
+            ],
+        )
+
+    def _parse_body(self, data):
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser().parsebytes(
+                b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + data
+            )
+            return {
+                part.get_param("name", header="content-disposition"): (
+                    part.get_payload(decode=True)
+                    if part.get_filename()
+                    else part.get_payload(decode=True).decode()
+                )
+                for part in message.get_payload()
+            }
+        if content_type.startswith("application/x-www-form-urlencoded"):
+            return {key: values[-1] for key, values in parse_qs(data.decode()).items()}
+        return json.loads(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class FakePulpServer(ThreadingHTTPServer):
+    """Serve a `FakePulp` on a background thread. Use as a context manager."""
+
+    daemon_threads = True
+
+    def __init__(self, fake, host="127.0.0.1", port=0):
+        super().__init__((host, port), FakePulpRequestHandler)
+        self.fake = fake
+        self.url = f"http://{host}:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--spec", required=True, help="api specification (json, may be gzipped)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--task-delay", type=float, default=0.0, help="seconds until a task completes"
+    )
+    parser.add_argument(
+        "--upstream-units",
+        type=int,
+        default=0,
+        help="units of content syncs find on remotes",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="online workers in the status")
+    parser.add_argument(
+        "--waiting-tasks", type=int, default=0, help="tasks waiting in the queue forever"
+    )
+    parser.add_argument(
+        "--unavailable-every", type=int, default=0, help="fail every nth GET request with 503"
+    )
+    parser.add_argument(
+        "--retry-after", type=int, help="seconds the 503 responses ask clients to wait"
+    )
+    args = parser.parse_args()
+
+    fake = FakePulp(load_spec(args.spec), task_delay=args.task_delay)
+    fake.upstream_units = args.upstream_units
+    fake.worker_count = args.workers
+    fake.seed(fake.tasks_path, [{"name": "backlog", "state": "waiting"}] * args.waiting_tasks)
+    fake.unavailable_every = args.unavailable_every
+    fake.retry_after = args.retry_after
+    server = FakePulpServer(fake, host=args.host, port=args.port)
+    print(f"Serving fake Pulp on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()